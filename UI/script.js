@@ -0,0 +1,161 @@
+// LinkedIn Scraper UI - submits jobs and follows their live event stream.
+
+const els = {
+    url: document.getElementById('company-url'),
+    limit: document.getElementById('profile-limit'),
+    delay: document.getElementById('delay-time'),
+    start: document.getElementById('start-scraping'),
+    viewResults: document.getElementById('view-results'),
+    clearData: document.getElementById('clear-data'),
+    statusDot: document.getElementById('status-dot'),
+    statusText: document.getElementById('status-text'),
+    progressSection: document.getElementById('progress-section'),
+    progressText: document.getElementById('progress-text'),
+    progressFill: document.getElementById('progress-fill'),
+    currentProfile: document.getElementById('current-profile'),
+    timeRemaining: document.getElementById('time-remaining'),
+    resultsSection: document.getElementById('results-section'),
+    totalProfiles: document.getElementById('total-profiles'),
+    successCount: document.getElementById('developer-count'),
+    successRate: document.getElementById('success-rate'),
+    exportResults: document.getElementById('export-results')
+};
+
+const STATUS_COLORS = { ready: '#28a745', running: '#0077b5', error: '#dc3545' };
+const TERMINAL_STATES = ['finished', 'failed', 'cancelled'];
+
+let stream = null;
+let stats = { done: 0, total: 0, failed: 0 };
+
+function setStatus(kind, text) {
+    els.statusDot.style.background = STATUS_COLORS[kind];
+    els.statusText.textContent = text;
+}
+
+function formatSeconds(seconds) {
+    if (seconds == null) return '--:--';
+    const m = Math.floor(seconds / 60);
+    const s = Math.round(seconds % 60);
+    return `${m}:${String(s).padStart(2, '0')}`;
+}
+
+function renderProgress() {
+    const pct = stats.total ? Math.round((stats.done / stats.total) * 100) : 0;
+    els.progressFill.style.width = `${pct}%`;
+    els.currentProfile.textContent = `Profile: ${stats.done}/${stats.total}`;
+}
+
+function renderResults() {
+    const succeeded = stats.done - stats.failed;
+    els.resultsSection.style.display = 'block';
+    els.totalProfiles.textContent = stats.done;
+    els.successCount.textContent = succeeded;
+    els.successRate.textContent = stats.done ? `${Math.round((succeeded / stats.done) * 100)}%` : '0%';
+}
+
+function handleEvent(event) {
+    switch (event.type) {
+        case 'job': {
+            const job = event.job;
+            stats.done = job.profiles_done;
+            stats.total = job.profiles_total || stats.total;
+            els.timeRemaining.textContent = `Time remaining: ${formatSeconds(job.eta_seconds)}`;
+            renderProgress();
+            if (TERMINAL_STATES.includes(job.status)) {
+                stream.close();
+                stream = null;
+                els.start.disabled = false;
+                els.progressText.textContent = job.status === 'finished'
+                    ? `Done - saved to ${job.result && job.result.output}`
+                    : `Job ${job.status}${job.error ? `: ${job.error}` : ''}`;
+                setStatus(job.status === 'finished' ? 'ready' : 'error', job.status === 'finished' ? 'Ready' : 'Stopped');
+                renderResults();
+            } else {
+                els.progressText.textContent = `Job ${job.status} (${job.phase})`;
+            }
+            break;
+        }
+        case 'phase':
+            els.progressText.textContent = event.phase === 'collecting'
+                ? `Collecting ${event.role_name} profile URLs...`
+                : `Scraping ${event.total} ${event.role_name} profiles...`;
+            if (event.total) stats.total = event.total;
+            renderProgress();
+            break;
+        case 'url_collected':
+            els.progressText.textContent = `Collected ${event.count} profile URLs...`;
+            break;
+        case 'profile_started':
+            els.progressText.textContent = `Scraping ${event.url}`;
+            break;
+        case 'profile_finished': {
+            stats.done = event.done;
+            stats.total = event.total;
+            if (event.failed) stats.failed += 1;
+            const timings = event.timings || {};
+            const parts = Object.entries(timings).map(([stage, secs]) => `${stage} ${secs.toFixed(1)}s`);
+            els.progressText.textContent = `Finished ${event.url}${parts.length ? ` (${parts.join(', ')})` : ''}`;
+            renderProgress();
+            break;
+        }
+        case 'error':
+            els.progressText.textContent = `Error: ${event.message}`;
+            break;
+    }
+}
+
+function follow(jobId) {
+    if (stream) stream.close();
+    stream = new EventSource(`/jobs/${encodeURIComponent(jobId)}/events`);
+    stream.onmessage = (message) => handleEvent(JSON.parse(message.data));
+}
+
+async function startScraping() {
+    const payload = {
+        search_url: els.url.value.trim(),
+        limit: parseInt(els.limit.value, 10) || 5,
+        delay: parseInt(els.delay.value, 10) || 5
+    };
+    els.start.disabled = true;
+    try {
+        const response = await fetch('/start-scraping', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(payload)
+        });
+        const data = await response.json();
+        if (data.status !== 'success') throw new Error(data.message);
+
+        stats = { done: 0, total: payload.limit, failed: 0 };
+        els.progressSection.style.display = 'block';
+        els.resultsSection.style.display = 'none';
+        setStatus('running', 'Running');
+        renderProgress();
+        follow(data.job.id);
+    } catch (error) {
+        els.start.disabled = false;
+        setStatus('error', 'Error');
+        alert(`Could not start scraping: ${error.message}`);
+    }
+}
+
+async function openResults() {
+    const response = await fetch('/open-excel');
+    const data = await response.json();
+    if (data.status !== 'success') alert(data.message);
+}
+
+function clearData() {
+    if (stream) stream.close();
+    stream = null;
+    stats = { done: 0, total: 0, failed: 0 };
+    els.start.disabled = false;
+    els.progressSection.style.display = 'none';
+    els.resultsSection.style.display = 'none';
+    setStatus('ready', 'Ready');
+}
+
+els.start.addEventListener('click', startScraping);
+els.viewResults.addEventListener('click', openResults);
+els.exportResults.addEventListener('click', openResults);
+els.clearData.addEventListener('click', clearData);
@@ -1,13 +1,361 @@
-from flask import Flask, send_from_directory, jsonify, request
+from flask import Flask, Response, send_from_directory, jsonify, request, stream_with_context
 import os
 import sys
+import json
+import time
+import queue
+import sqlite3
 import subprocess
 import asyncio
 import threading
-from scraper import main as scraper_main
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import scraper
+from scraper import (BrowserPool, ResourcePolicy, scrape, new_job_id, run_metrics, resolve_fields,
+                     resolve_card_fields, cookies_path, OUTPUT_SINKS, CACHE_POLICIES, EXTRACTION_MODES)
 
 app = Flask(__name__, static_folder='')
 
+# Jobs allowed to run at the same time on the LinkedIn session. Every pool
+# context loads the same cookies file, so all jobs share that one account.
+MAX_JOBS_PER_SESSION = int(os.environ.get("SCRAPER_MAX_JOBS_PER_SESSION", "1"))
+SESSION_NAME = str(cookies_path)
+# Number of pre-warmed, logged-in browser contexts kept by the server; more
+# than MAX_JOBS_PER_SESSION would never be leased.
+POOL_SIZE = int(os.environ.get("SCRAPER_POOL_SIZE", str(MAX_JOBS_PER_SESSION)))
+JOBS_DB = os.environ.get("SCRAPER_JOBS_DB", "ui_jobs.sqlite")
+
+ACTIVE_STATES = ("queued", "running")
+# Seconds between SSE keep-alive comments on an idle stream.
+SSE_KEEPALIVE = 15
+
+
+class JobStore:
+    """SQLite-backed job queue shared by the Flask threads and the service loop."""
+
+    COLUMNS = ("id", "account", "search_url", "profile_limit", "options", "status", "phase",
+               "done", "total", "error", "result", "created_at", "started_at",
+               "scrape_started_at", "finished_at")
+
+    def __init__(self, path=JOBS_DB):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, account TEXT NOT NULL, search_url TEXT NOT NULL, "
+            "profile_limit INTEGER NOT NULL, options TEXT NOT NULL DEFAULT '{}', "
+            "status TEXT NOT NULL, phase TEXT, done INTEGER NOT NULL DEFAULT 0, "
+            "total INTEGER NOT NULL DEFAULT 0, error TEXT, result TEXT, created_at REAL NOT NULL, "
+            "started_at REAL, scrape_started_at REAL, finished_at REAL)"
+        )
+        # Jobs interrupted by a server restart go back to the queue; their
+        # scraper journal lets them resume where they stopped.
+        self._conn.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+        self._conn.commit()
+
+    def create(self, account, search_url, limit, options):
+        job_id = new_job_id()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, account, search_url, profile_limit, options, status, phase, created_at) "
+                "VALUES (?, ?, ?, ?, ?, 'queued', 'queued', ?)",
+                (job_id, account, search_url, limit, json.dumps(options), time.time())
+            )
+            self._conn.commit()
+        return self.get(job_id)
+
+    def update(self, job_id, **fields):
+        if not fields:
+            return
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def transition(self, job_id, from_status, **fields):
+        """Apply `fields` only if the job is still in `from_status`; returns whether it was."""
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            cursor = self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ? AND status = ?",
+                                        (*fields.values(), job_id, from_status))
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(zip(self.COLUMNS, row)) if row else None
+
+    def list(self, statuses=None):
+        query = f"SELECT {', '.join(self.COLUMNS)} FROM jobs"
+        params = ()
+        if statuses:
+            query += f" WHERE status IN ({', '.join('?' for _ in statuses)})"
+            params = tuple(statuses)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at", params).fetchall()
+        return [dict(zip(self.COLUMNS, row)) for row in rows]
+
+
+def job_view(job):
+    """Public JSON shape of a job, with an ETA from the scraping rate so far."""
+    view = {
+        "id": job["id"],
+        "session": job["account"],
+        "search_url": job["search_url"],
+        "limit": job["profile_limit"],
+        "status": job["status"],
+        "phase": job["phase"],
+        "profiles_done": job["done"],
+        "profiles_total": job["total"],
+        "error": job["error"],
+        "result": json.loads(job["result"]) if job["result"] else None,
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "eta_seconds": None
+    }
+    if job["status"] == "running" and job["scrape_started_at"] and job["done"] and job["total"]:
+        per_profile = (time.time() - job["scrape_started_at"]) / job["done"]
+        view["eta_seconds"] = round(per_profile * max(job["total"] - job["done"], 0))
+    return view
+
+
+class EventBroker:
+    """Fans events out to live viewers.
+
+    Each event is serialised once and pushed onto a bounded queue per
+    subscriber; a viewer that falls behind loses events instead of slowing
+    the scraper down.
+    """
+
+    def __init__(self, max_pending=1000):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+    def subscribe(self, job_id=None):
+        subscriber = (job_id, queue.Queue(maxsize=self.max_pending))
+        with self._lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def publish(self, event):
+        payload = json.dumps(event)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for job_id, pending in subscribers:
+            if job_id is not None and event.get("job_id") != job_id:
+                continue
+            try:
+                pending.put_nowait(payload)
+            except queue.Full:
+                pass
+
+
+class ScraperService:
+    """Long-lived event loop thread that owns a warm BrowserPool and the job scheduler.
+
+    Flask handlers only write to the JobStore and wake the scheduler; jobs run
+    as tasks on the service loop, each leasing a logged-in context from the
+    pool, with at most MAX_JOBS_PER_SESSION running on the shared session.
+    """
+
+    def __init__(self, store, broker, pool_size=POOL_SIZE, max_jobs_per_session=MAX_JOBS_PER_SESSION):
+        self.store = store
+        self.broker = broker
+        self.max_jobs_per_session = max_jobs_per_session
+        self.loop = asyncio.new_event_loop()
+        self.pool = BrowserPool(size=pool_size, headless=True, resource_policy=ResourcePolicy())
+        self._pool_ready = None
+        self._wakeup = None
+        self._tasks = {}
+        self._thread = threading.Thread(target=self._run, name="scraper-service", daemon=True)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self._wakeup = asyncio.Event()
+        self._pool_ready = self.loop.create_task(self.pool.start())
+        self.loop.create_task(self._schedule())
+        self.loop.run_forever()
+
+    def start(self):
+        if not self._thread.is_alive():
+            self._thread.start()
+
+    def wake(self):
+        self.start()
+        self.loop.call_soon_threadsafe(lambda: self._wakeup.set())
+
+    def cancel(self, job_id):
+        job = self.store.get(job_id)
+        if not job or job["status"] not in ACTIVE_STATES:
+            return job
+        # The scheduler may promote a queued job at any moment, so only a job
+        # still queued in the store is cancelled here; otherwise its task is.
+        if job["status"] == "queued" and self.store.transition(
+                job_id, "queued", status="cancelled", phase="cancelled", finished_at=time.time()):
+            self.publish_job(job_id)
+        else:
+            self.loop.call_soon_threadsafe(self._cancel_task, job_id)
+        return self.store.get(job_id)
+
+    def set_status(self, job_id, **fields):
+        """Update a job and tell live viewers about its new state."""
+        self.store.update(job_id, **fields)
+        self.publish_job(job_id)
+
+    def publish_job(self, job_id):
+        self.broker.publish({"type": "job", "job_id": job_id, "time": time.time(),
+                             "job": job_view(self.store.get(job_id))})
+
+    def _cancel_task(self, job_id):
+        task = self._tasks.get(job_id)
+        if task:
+            task.cancel()
+
+    async def _schedule(self):
+        while True:
+            running = len(self._tasks)
+            for job in self.store.list(statuses=("queued",)):
+                if running >= self.max_jobs_per_session:
+                    break
+                if not self.store.transition(job["id"], "queued", status="running", phase="starting",
+                                             started_at=time.time()):
+                    # Cancelled since it was listed.
+                    continue
+                running += 1
+                self.publish_job(job["id"])
+                task = self.loop.create_task(self._run_job(job))
+                self._tasks[job["id"]] = task
+                task.add_done_callback(lambda _t, job_id=job["id"]: self._job_done(job_id))
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+    def _job_done(self, job_id):
+        self._tasks.pop(job_id, None)
+        self._wakeup.set()
+
+    def _on_event(self, event):
+        job_id = event["job_id"]
+        self.broker.publish(event)
+        if event["type"] == "phase":
+            fields = {"phase": event["phase"]}
+            if event["phase"] == "scraping":
+                fields.update(total=event["total"], scrape_started_at=event["time"])
+            self.store.update(job_id, **fields)
+        elif event["type"] == "profile_finished":
+            self.store.update(job_id, done=event["done"], total=event["total"])
+
+    async def _ensure_pool(self):
+        """Wait for the pool start shared by all jobs, restarting it if it failed."""
+        ready = self._pool_ready
+        if ready.done() and (ready.cancelled() or ready.exception() is not None):
+            self._pool_ready = ready = self.loop.create_task(self.pool.start())
+        # Shielded: cancelling one waiting job must not cancel the start for the others.
+        await asyncio.shield(ready)
+
+    async def _run_job(self, job):
+        job_id = job["id"]
+        try:
+            await self._ensure_pool()
+            context, page = await self.pool.lease()
+            try:
+                run = scrape(job["search_url"], job["profile_limit"], context=context, page=page,
+                             job_id=job_id, on_event=self._on_event, **json.loads(job["options"]))
+                async for _ in run:
+                    pass
+                summary = run.summary
+            finally:
+                await self.pool.release(context, page)
+            self.set_status(job_id, status="finished", phase="done", result=json.dumps(summary),
+                            finished_at=time.time())
+        except asyncio.CancelledError:
+            self.set_status(job_id, status="cancelled", phase="cancelled", finished_at=time.time())
+        except Exception as e:
+            print(f"Scraper error in job {job_id}: {e}")
+            self.broker.publish({"type": "error", "job_id": job_id, "time": time.time(), "message": str(e)})
+            self.set_status(job_id, status="failed", phase="failed", error=str(e), finished_at=time.time())
+
+
+store = JobStore()
+broker = EventBroker()
+service = ScraperService(store, broker)
+
+
+def submit_job(data):
+    """Validate a job payload and queue it; returns (job view, error message)."""
+    search_url = data.get('search_url') or data.get('url')
+    if not search_url or "linkedin.com/search/results/people" not in search_url:
+        return None, "A LinkedIn people search results URL is required."
+    try:
+        limit = int(data.get('limit', 5))
+        concurrency = int(data['concurrency']) if data.get('concurrency') else None
+        delay_seconds = float(data['delay']) if data.get('delay') else None
+    except (TypeError, ValueError):
+        return None, "limit, concurrency and delay must be numbers."
+    if limit < 1 or (concurrency is not None and concurrency < 1) or (delay_seconds or 0) < 0:
+        return None, "limit and concurrency must be positive and delay not negative."
+    options = {}
+    if concurrency:
+        options["concurrency"] = concurrency
+    if delay_seconds:
+        # UI delay is in seconds; jitter up to 60% above it like the CLI profiles.
+        delay_ms = int(delay_seconds * 1000)
+        options["delay_profile"] = [delay_ms, int(delay_ms * 1.6)]
+    for key, allowed in (("output", OUTPUT_SINKS), ("cache", CACHE_POLICIES), ("extraction", EXTRACTION_MODES)):
+        if data.get(key):
+            if data[key] not in allowed:
+                return None, f"Unknown {key} {data[key]!r}; choose from {', '.join(allowed)}."
+            options[key] = data[key]
+    if data.get('pipeline'):
+        options["pipeline"] = True
+    if data.get('cards_only'):
+        options["cards_only"] = True
+    if data.get('fields'):
+        try:
+            resolve = resolve_card_fields if options.get("cards_only") else resolve_fields
+            options["fields"] = list(resolve(data['fields']))
+        except ValueError as e:
+            return None, str(e)
+    job = store.create(SESSION_NAME, search_url, limit, options)
+    broker.publish({"type": "job", "job_id": job["id"], "time": time.time(), "job": job_view(job)})
+    service.wake()
+    return job_view(job), None
+
+
+def event_stream(job_id=None):
+    """Server-Sent Events response for one job's events, or all events."""
+    subscriber = broker.subscribe(job_id)
+
+    def generate():
+        try:
+            if job_id:
+                job = store.get(job_id)
+                if job:
+                    # Late viewers start from the current state.
+                    yield f"data: {json.dumps({'type': 'job', 'job_id': job_id, 'job': job_view(job)})}\n\n"
+            while True:
+                try:
+                    payload = subscriber[1].get(timeout=SSE_KEEPALIVE)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {payload}\n\n"
+        finally:
+            broker.unsubscribe(subscriber)
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 @app.route('/')
 def index():
     return send_from_directory('', 'index.html')
@@ -34,27 +382,68 @@ def open_excel():
 def start_scraping():
     try:
         data = request.get_json()
-        limit = data.get('limit', 5)
         delay = data.get('delay', 5)
-
-        # Run scraper in a separate thread to avoid blocking
-        def run_scraper():
-            try:
-                asyncio.run(scraper_main(limit=limit))
-            except Exception as e:
-                print(f"Scraper error: {e}")
-
-        thread = threading.Thread(target=run_scraper)
-        thread.daemon = True
-        thread.start()
+        job, error = submit_job(data)
+        if error:
+            return jsonify({"status": "error", "message": error}), 400
 
         return jsonify({
             "status": "success",
-            "message": f"Started scraping {limit} profiles with {delay}s delay between profiles."
+            "job": job,
+            "message": f"Queued scraping of {job['limit']} profiles with {delay}s delay between profiles."
         })
 
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    job, error = submit_job(request.get_json() or {})
+    if error:
+        return jsonify({"status": "error", "message": error}), 400
+    return jsonify({"status": "success", "job": job}), 202
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    statuses = request.args.getlist('status')
+    return jsonify({"status": "success", "jobs": [job_view(j) for j in store.list(statuses or None)]})
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = store.get(job_id)
+    if not job:
+        return jsonify({"status": "error", "message": "Job not found."}), 404
+    return jsonify({"status": "success", "job": job_view(job)})
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    job = service.cancel(job_id)
+    if not job:
+        return jsonify({"status": "error", "message": "Job not found."}), 404
+    return jsonify({"status": "success", "job": job_view(job)})
+
+@app.route('/events')
+def all_events():
+    return event_stream()
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    if not store.get(job_id):
+        return jsonify({"status": "error", "message": "Job not found."}), 404
+    return event_stream(job_id)
+
+@app.route('/metrics')
+def metrics():
+    """Stage timings and counters in the Prometheus text format."""
+    return Response(run_metrics.to_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/metrics.json')
+def metrics_json():
+    # Looked up on the module: set_rate_limit() replaces the global limiter.
+    return jsonify({"status": "success", "metrics": run_metrics.summary(),
+                    "rate_limit": scraper.rate_limiter.snapshot()})
+
 if __name__ == '__main__':
-    app.run(debug=True)
+    # Warm the pool before the first request; the reloader would start a second browser.
+    service.start()
+    app.run(debug=True, use_reloader=False)
@@ -0,0 +1,264 @@
+"""Offline scraper benchmark against the local LinkedIn-like fixtures.
+
+    python bench/benchmark.py --profiles 30 --concurrency 3
+    python bench/benchmark.py --compare bench/results/<earlier run>.json
+
+Runs the real collect_search_profile_urls and scrape_profiles_concurrently
+headless against FixtureServer, with the rate limiter and worker delays
+turned off so only page work is measured. It reports profiles per minute,
+per-stage latency percentiles, memory and extraction accuracy against the
+generated profiles. Every run is saved as JSON under bench/results/ tagged
+with the current commit; fixtures and latencies come from --seed, so runs
+with the same options are comparable across commits.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from playwright.async_api import async_playwright
+from scraper import (BROWSER_ARGS, CONTEXT_OPTIONS, install_page_scripts, collect_search_profile_urls,
+                     scrape_profiles_concurrently, set_rate_limit, run_metrics, readiness_stats,
+                     is_failed_result, EXTRACTION_MODES)
+from fixture_server import FixtureServer
+
+RESULTS_DIR = Path(__file__).parent / "results"
+ACCURACY_FIELDS = ("name", "title", "location", "education", "total_experience", "experience_details", "skills")
+# Seconds between memory samples while the benchmark runs.
+MEMORY_SAMPLE_INTERVAL = 0.5
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+class MemorySampler:
+    """Peak RSS of this process and of its children (the Playwright driver and Chromium).
+
+    Needs psutil for the browser side; without it only this process's peak
+    RSS from the resource module is reported.
+    """
+
+    def __init__(self):
+        try:
+            import psutil
+        except ImportError:
+            psutil = None
+        self._psutil = psutil
+        self.peak_python_mb = 0.0
+        self.peak_browser_mb = None if psutil is None else 0.0
+        self._task = None
+
+    def sample(self):
+        if self._psutil is None:
+            try:
+                import resource
+            except ImportError:
+                return
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # ru_maxrss is KiB on Linux and bytes on macOS.
+            self.peak_python_mb = peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+            return
+        process = self._psutil.Process()
+        self.peak_python_mb = max(self.peak_python_mb, process.memory_info().rss / 2**20)
+        browser = 0
+        for child in process.children(recursive=True):
+            try:
+                browser += child.memory_info().rss
+            except self._psutil.Error:
+                continue
+        self.peak_browser_mb = max(self.peak_browser_mb, browser / 2**20)
+
+    async def _run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(MEMORY_SAMPLE_INTERVAL)
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self.sample()
+
+    def report(self):
+        return {
+            "peak_python_rss_mb": round(self.peak_python_mb, 1),
+            "peak_browser_rss_mb": None if self.peak_browser_mb is None else round(self.peak_browser_mb, 1)
+        }
+
+def score_accuracy(server, results):
+    """Share of profiles whose extracted field equals the fixture's expected value."""
+    expected = {p["expected"]["url"]: p["expected"] for p in server.profiles}
+    matched = {field: 0 for field in ACCURACY_FIELDS}
+    exact = 0
+    for result in results:
+        want = expected.get(result.get("url"))
+        if not want:
+            continue
+        fields_ok = [field for field in ACCURACY_FIELDS if result.get(field) == want[field]]
+        for field in fields_ok:
+            matched[field] += 1
+        exact += len(fields_ok) == len(ACCURACY_FIELDS)
+    total = len(results) or 1
+    return {"exact_profiles": exact, "fields": {field: round(n / total, 3) for field, n in matched.items()}}
+
+async def close_quietly(context, browser):
+    try:
+        await context.close()
+        await browser.close()
+    except Exception:
+        pass
+
+async def run_benchmark(profiles=30, concurrency=3, parallel_details=False, pipeline=False, seed=1,
+                        latency_ms=150, lazy_ms=250, extraction="dom", headless=True):
+    run_metrics.reset()
+    readiness_stats.clear()
+    set_rate_limit(0)
+    server = FixtureServer(profiles=profiles, seed=seed, latency_ms=latency_ms, lazy_ms=lazy_ms).start()
+    memory = MemorySampler()
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=headless, args=BROWSER_ARGS)
+            context = await browser.new_context(**CONTEXT_OPTIONS)
+            await install_page_scripts(context)
+            await context.route("https://www.linkedin.com/**", server.route)
+            page = await context.new_page()
+            memory.start()
+
+            started = time.monotonic()
+            first_result = {}
+
+            def on_result(url, result):
+                first_result.setdefault("seconds", time.monotonic() - started)
+
+            if pipeline:
+                queue = asyncio.Queue()
+
+                async def collect():
+                    try:
+                        return await collect_search_profile_urls(page, server.search_url(), profiles, "Benchmark",
+                                                                 on_url=queue.put_nowait)
+                    finally:
+                        queue.put_nowait(None)
+
+                urls, results = await asyncio.gather(
+                    collect(),
+                    scrape_profiles_concurrently(context, queue, "Benchmark", concurrency,
+                                                 parallel_details=parallel_details, on_result=on_result,
+                                                 extraction=extraction, delay_range=(0, 0), total=profiles))
+                collect_seconds = None
+            else:
+                urls = await collect_search_profile_urls(page, server.search_url(), profiles, "Benchmark")
+                collect_seconds = time.monotonic() - started
+                results = await scrape_profiles_concurrently(context, urls, "Benchmark", concurrency,
+                                                             parallel_details=parallel_details,
+                                                             on_result=on_result, extraction=extraction,
+                                                             delay_range=(0, 0))
+            elapsed = time.monotonic() - started
+            await memory.stop()
+            await close_quietly(context, browser)
+    finally:
+        server.stop()
+
+    failed = sum(1 for r in results if is_failed_result(r))
+    metrics = run_metrics.summary()
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "options": {"profiles": profiles, "concurrency": concurrency, "parallel_details": parallel_details,
+                    "pipeline": pipeline, "seed": seed, "latency_ms": latency_ms, "lazy_ms": lazy_ms,
+                    "extraction": extraction},
+        "urls_collected": len(urls),
+        "profiles_scraped": len(results),
+        "profiles_failed": failed,
+        "elapsed_seconds": round(elapsed, 2),
+        "collect_seconds": None if collect_seconds is None else round(collect_seconds, 2),
+        "time_to_first_result": round(first_result.get("seconds", elapsed), 2),
+        "profiles_per_minute": round(len(results) / elapsed * 60, 2) if elapsed else 0.0,
+        "stages": metrics["stages"],
+        "counters": metrics["counters"],
+        "readiness": readiness_stats,
+        "requests": dict(server.requests),
+        "memory": memory.report(),
+        "accuracy": score_accuracy(server, results)
+    }
+
+def print_report(report):
+    print(f"\n🏁 Benchmark @ {report['commit']}: {report['profiles_scraped']} profiles "
+          f"({report['profiles_failed']} failed) in {report['elapsed_seconds']}s")
+    print(f"   profiles/min         {report['profiles_per_minute']}")
+    if report["collect_seconds"] is not None:
+        print(f"   URL collection       {report['collect_seconds']}s for {report['urls_collected']} URLs")
+    print(f"   first result after   {report['time_to_first_result']}s")
+    memory = report["memory"]
+    browser_mb = memory["peak_browser_rss_mb"]
+    print(f"   peak RSS             python {memory['peak_python_rss_mb']} MB, "
+          f"browser {f'{browser_mb} MB' if browser_mb is not None else 'n/a (install psutil)'}")
+    accuracy = report["accuracy"]
+    print(f"   exact profiles       {accuracy['exact_profiles']}/{report['profiles_scraped']}")
+    print("   field accuracy       " + ", ".join(f"{k}={v:.0%}" for k, v in accuracy["fields"].items()))
+    run_metrics.print_report()
+
+def print_comparison(report, baseline):
+    """Percent change of headline numbers and stage p50/p95 against `baseline`."""
+    def change(new, old):
+        if not old:
+            return "n/a"
+        return f"{(new - old) / old:+.1%}"
+
+    print(f"\n⚖️ Compared with {baseline['commit']} ({baseline['timestamp']}):")
+    if baseline.get("options") != report["options"]:
+        print("   ⚠️ options differ, numbers are not directly comparable")
+    for key in ("profiles_per_minute", "elapsed_seconds", "time_to_first_result"):
+        print(f"   {key:<24} {baseline[key]:>9} -> {report[key]:>9}  {change(report[key], baseline[key])}")
+    for stage, stats in sorted(report["stages"].items()):
+        old = baseline["stages"].get(stage)
+        if not old:
+            continue
+        print(f"   {stage:<24} p50 {old['p50']:>7.2f} -> {stats['p50']:>7.2f} {change(stats['p50'], old['p50']):>8}"
+              f"   p95 {old['p95']:>7.2f} -> {stats['p95']:>7.2f} {change(stats['p95'], old['p95']):>8}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against local LinkedIn-like fixtures.")
+    parser.add_argument("--profiles", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--parallel-details", action="store_true")
+    parser.add_argument("--pipeline", action="store_true")
+    parser.add_argument("--extraction", choices=EXTRACTION_MODES, default="dom")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency-ms", type=int, default=150, help="mean simulated response latency")
+    parser.add_argument("--lazy-ms", type=int, default=250, help="delay before each lazy-loaded batch")
+    parser.add_argument("--headed", dest="headless", action="store_false")
+    parser.add_argument("--output", help="where to write the JSON report (default bench/results/)")
+    parser.add_argument("--compare", metavar="REPORT", help="earlier JSON report to compare against")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(run_benchmark(profiles=args.profiles, concurrency=args.concurrency,
+                                       parallel_details=args.parallel_details, pipeline=args.pipeline,
+                                       seed=args.seed, latency_ms=args.latency_ms, lazy_ms=args.lazy_ms,
+                                       extraction=args.extraction, headless=args.headless))
+    print_report(report)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_comparison(report, json.load(f))
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['commit']}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\n📁 Report saved to {output}")
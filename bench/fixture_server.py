@@ -0,0 +1,262 @@
+"""Local HTTP server for the benchmark's LinkedIn-like fixture pages.
+
+Profiles are generated from a seed, so every run (and every commit) sees the
+same search results, profiles and detail pages. Pages are rendered from the
+templates in fixtures/ with the DOM structure scraper.py targets, list items
+arrive through the simulated lazy loader, and every response is delayed by
+a per-URL latency that is also derived from the seed.
+"""
+import asyncio
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from html import escape
+from pathlib import Path
+from string import Template
+from urllib.error import HTTPError
+from urllib.parse import urlparse, parse_qs
+from urllib.request import urlopen
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SEARCH_PAGE_SIZE = 10
+# Items the main profile page shows per section before a "Show all" link.
+MAIN_PAGE_LIMITS = {"experience": 5, "education": 2, "skills": 3}
+
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Neha", "Arjun", "Kavya", "Siddharth", "Meera",
+               "Rahul", "Isha", "Karan", "Divya", "Aditya", "Pooja", "Nikhil", "Sneha", "Varun", "Ritu"]
+LAST_NAMES = ["Sharma", "Iyer", "Patel", "Reddy", "Gupta", "Nair", "Menon", "Rao", "Kapoor", "Joshi",
+              "Singh", "Desai", "Kulkarni", "Bose", "Chatterjee"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Engineering Manager", "HR Business Partner",
+          "Talent Acquisition Lead", "Sales Manager", "Account Executive", "Data Scientist",
+          "Product Manager", "Backend Developer"]
+CITIES = ["Bengaluru, Karnataka, India", "Mumbai, Maharashtra, India", "Pune, Maharashtra, India",
+          "Hyderabad, Telangana, India", "Gurugram, Haryana, India", "Chennai, Tamil Nadu, India"]
+SCHOOLS = ["Indian Institute of Technology Bombay", "National Institute of Technology Trichy",
+           "BITS Pilani University", "Delhi College of Engineering", "University of Mumbai",
+           "Indian Institute of Management Ahmedabad", "Manipal Institute of Technology"]
+COMPANIES = ["Gameskraft", "Flipkart", "Swiggy", "Razorpay", "Zomato", "Infosys", "Freshworks",
+             "PhonePe", "CRED", "Meesho", "Dream11", "Zerodha"]
+SKILLS = ["Python", "Java", "Go", "Kubernetes", "SQL", "React", "System Design", "Recruiting",
+          "Negotiation", "Stakeholder Management", "Machine Learning", "AWS", "Leadership",
+          "Microservices", "Sales Strategy", "Talent Management", "Docker", "Distributed Systems",
+          "Payroll", "Employee Relations", "B2B Sales", "Data Analysis", "Spark", "Kafka",
+          "Product Strategy", "Agile Methodologies", "C++", "TypeScript", "Redis", "GraphQL"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+def load_template(name):
+    return Template((FIXTURES_DIR / name).read_text(encoding="utf-8"))
+
+def format_span(years, months):
+    parts = []
+    if years:
+        parts.append(f"{years} yr{'s' if years > 1 else ''}")
+    if months:
+        parts.append(f"{months} mo{'s' if months > 1 else ''}")
+    return " ".join(parts)
+
+def make_profile(index, seed):
+    """Deterministic profile data plus the row scrape_profile should produce for it."""
+    rng = random.Random(f"{seed}-{index}")
+    username = f"bench-{index:04d}"
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    schools = rng.sample(SCHOOLS, rng.randint(1, 3))
+    skills = rng.sample(SKILLS, rng.randint(5, 25))
+
+    experiences = []
+    year, month = 2025, rng.randint(1, 12)
+    for position in range(rng.randint(1, 7)):
+        length = rng.randint(4, 60)
+        start_index = year * 12 + month - 1 - length
+        start_year, start_month = divmod(start_index, 12)
+        end = "Present" if position == 0 else f"{MONTHS[month - 1]} {year}"
+        experiences.append({
+            "company": rng.choice(COMPANIES),
+            "title": rng.choice(TITLES),
+            "duration": f"{MONTHS[start_month]} {start_year} - {end} · {format_span(*divmod(length, 12))}",
+            "months": length
+        })
+        gap = rng.randint(0, 6)
+        year, month = divmod(start_index - gap, 12)
+        month += 1
+
+    total_months = sum(e["months"] for e in experiences)
+    profile = {
+        "username": username,
+        "name": name,
+        "title": f"{experiences[0]['title']} at {experiences[0]['company']}",
+        "location": rng.choice(CITIES),
+        "about": " ".join(rng.sample(SKILLS, 6)),
+        "schools": schools,
+        "experiences": experiences,
+        "skills": skills
+    }
+    # The experience extractor sums years and months separately, then carries.
+    years = sum(e["months"] // 12 for e in experiences)
+    months = sum(e["months"] % 12 for e in experiences)
+    years, months = years + months // 12, months % 12
+    profile["expected"] = {
+        "name": name,
+        "title": profile["title"],
+        "location": profile["location"],
+        "education": schools[0],
+        "url": f"https://www.linkedin.com/in/{username}/",
+        "total_experience": f"{years} yrs {months} mos" if total_months else "",
+        "experience_details": " || ".join(f"{e['company']} | {e['title']} | {e['duration']}"
+                                          for e in experiences[:5]),
+        "skills": " | ".join(skills)
+    }
+    return profile
+
+def search_card_html(profile):
+    url = f"https://www.linkedin.com/in/{profile['username']}/?miniProfileUrn=urn%3Ali%3Afsd_profile%3A{profile['username']}"
+    return (
+        '<li class="reusable-search__result-container"><div class="entity-result">'
+        f'<div class="entity-result__title-text"><a class="app-aware-link" href="{escape(url)}">'
+        f'<span aria-hidden="true">{escape(profile["name"])}</span></a></div>'
+        f'<div class="entity-result__primary-subtitle t-14 t-black t-normal">{escape(profile["title"])}</div>'
+        f'<div class="entity-result__secondary-subtitle t-14 t-normal">{escape(profile["location"])}</div>'
+        '</div></li>'
+    )
+
+def list_item_html(bold_text, extra="", css="pvs-list__paged-list-item artdeco-list__item"):
+    return (
+        f'<li class="{css}"><div class="pvs-entity">'
+        '<div class="display-flex flex-column full-width">'
+        '<div class="display-flex align-items-center mr1 hoverable-link-text t-bold">'
+        f'<span aria-hidden="true">{escape(bold_text)}</span></div>{extra}'
+        '</div></div></li>'
+    )
+
+def section_items_html(profile, section, limit=None, **item_options):
+    if section == "education":
+        return "".join(list_item_html(school, '<span class="t-14 t-normal"><span aria-hidden="true">'
+                                              'Bachelor of Technology</span></span>', **item_options)
+                       for school in profile["schools"][:limit])
+    if section == "skills":
+        return "".join(list_item_html(skill, **item_options) for skill in profile["skills"][:limit])
+    return "".join(
+        list_item_html(e["title"],
+                       f'<span class="t-14 t-normal"><span aria-hidden="true">{escape(e["company"])}</span></span>'
+                       f'<span class="t-14 t-normal t-black--light"><span class="pvs-entity__caption-wrapper" '
+                       f'aria-hidden="true">{escape(e["duration"])}</span></span>', **item_options)
+        for e in profile["experiences"][:limit]
+    )
+
+SECTION_LISTS = {"experience": "experiences", "education": "schools", "skills": "skills"}
+
+def main_section_html(profile, section):
+    """A main-profile section: the first few items, plus "Show all" when there are more."""
+    limit = MAIN_PAGE_LIMITS[section]
+    items = section_items_html(profile, section, limit, css="artdeco-list__item pvs-list__item--line-separated")
+    total = len(profile[SECTION_LISTS[section]])
+    more = ""
+    if total > limit:
+        more = (f'<div class="pvs-list__footer-wrapper"><a id="navigation-index-see-all-{section}" '
+                f'href="/in/{profile["username"]}/details/{section}/">Show all {total} {SECTION_LISTS[section]}</a></div>')
+    return f'<ul class="pvs-list">{items}</ul>{more}'
+
+class FixtureServer:
+    """Serve search, profile and details pages for `profiles` generated profiles.
+
+        server = FixtureServer(profiles=30).start()
+        await context.route("https://www.linkedin.com/**", server.route)
+    """
+
+    SECTION_HEADINGS = {"experience": "Experience", "education": "Education", "skills": "Skills"}
+
+    def __init__(self, profiles=30, seed=1, latency_ms=150, lazy_ms=250, render_ms=150, batch=5,
+                 host="127.0.0.1", port=0):
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.page_options = {"lazy_ms": lazy_ms, "render_ms": render_ms, "batch": batch,
+                             "lazyload": (FIXTURES_DIR / "lazyload.js").read_text(encoding="utf-8")}
+        self.profiles = [make_profile(i, seed) for i in range(1, profiles + 1)]
+        self.by_username = {p["username"]: p for p in self.profiles}
+        self.templates = {name: load_template(f"{name}.html") for name in ("search", "profile", "details")}
+        self.requests = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def search_url(self, keywords="engineer"):
+        return f"https://www.linkedin.com/search/results/people/?keywords={keywords}&origin=GLOBAL_SEARCH_HEADER"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def latency_for(self, path):
+        rng = random.Random(f"{self.seed}-{path}")
+        return rng.uniform(0.5, 1.5) * self.latency_ms / 1000
+
+    def render(self, path, query):
+        """(status, kind, html) for a LinkedIn path."""
+        parts = [p for p in path.split("/") if p]
+        if parts[:3] == ["search", "results", "people"]:
+            page = int(query.get("page", ["1"])[0])
+            hits = self.profiles[(page - 1) * SEARCH_PAGE_SIZE:page * SEARCH_PAGE_SIZE]
+            summary = f"About {len(self.profiles)} results" if hits else "No results found"
+            return 200, "search", self.templates["search"].substitute(
+                keywords=escape(query.get("keywords", [""])[0]), summary=summary, page=page,
+                cards="".join(search_card_html(p) for p in hits), **self.page_options)
+        if len(parts) >= 2 and parts[0] == "in" and parts[1] in self.by_username:
+            profile = self.by_username[parts[1]]
+            if len(parts) == 2:
+                sections = {f"{section}_section": main_section_html(profile, section) for section in MAIN_PAGE_LIMITS}
+                return 200, "profile", self.templates["profile"].substitute(
+                    **{k: escape(v) for k, v in profile.items() if isinstance(v, str)}, **sections)
+            if len(parts) == 4 and parts[2] == "details" and parts[3] in self.SECTION_HEADINGS:
+                return 200, parts[3], self.templates["details"].substitute(
+                    heading=self.SECTION_HEADINGS[parts[3]], name=escape(profile["name"]),
+                    items=section_items_html(profile, parts[3]), **self.page_options)
+        return 404, "not_found", "<html><body><h1>Page not found</h1></body></html>"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                time.sleep(server.latency_for(parsed.path))
+                status, kind, html = server.render(parsed.path, parse_qs(parsed.query))
+                with server._lock:
+                    server.requests[kind] = server.requests.get(kind, 0) + 1
+                body = html.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def fetch(self, url):
+        """Blocking GET of a LinkedIn URL from this server: (status, body)."""
+        parsed = urlparse(url)
+        local = f"{self.base_url}{parsed.path}" + (f"?{parsed.query}" if parsed.query else "")
+        try:
+            with urlopen(local) as response:
+                return response.status, response.read()
+        except HTTPError as e:
+            return e.code, e.read()
+
+    async def route(self, route):
+        """Playwright route handler that answers www.linkedin.com from this server."""
+        loop = asyncio.get_running_loop()
+        status, body = await loop.run_in_executor(None, self.fetch, route.request.url)
+        await route.fulfill(status=status, body=body, content_type="text/html; charset=utf-8")
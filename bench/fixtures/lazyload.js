@@ -0,0 +1,37 @@
+// Simulated client-side rendering and lazy loading for the benchmark fixtures.
+// Items wait in <template id="pending"> and are appended to #lazy-list in
+// batches: the first batch after data-render ms, the rest data-delay ms after
+// the page is scrolled near the bottom.
+(function () {
+    var list = document.getElementById('lazy-list');
+    var pending = Array.prototype.slice.call(document.getElementById('pending').content.children);
+    var batch = parseInt(list.dataset.batch, 10);
+    var lazyMs = parseInt(list.dataset.delay, 10);
+    var loading = false;
+
+    function nearBottom() {
+        return window.innerHeight + window.scrollY >= document.body.scrollHeight - 300;
+    }
+
+    function appendBatch() {
+        pending.splice(0, batch).forEach(function (node) {
+            list.appendChild(document.importNode(node, true));
+        });
+    }
+
+    function maybeLoad() {
+        if (loading || !pending.length || !nearBottom()) return;
+        loading = true;
+        setTimeout(function () {
+            appendBatch();
+            loading = false;
+            maybeLoad();
+        }, lazyMs);
+    }
+
+    setTimeout(function () {
+        appendBatch();
+        maybeLoad();
+    }, parseInt(list.dataset.render, 10));
+    window.addEventListener('scroll', maybeLoad, { passive: true });
+})();
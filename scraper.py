@@ -1,12 +1,19 @@
+import argparse
 import asyncio
 import json
+import math
 import csv
+import hashlib
 import os
 import time
 import sys
 import subprocess
 import random
 import re
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
 from urllib.parse import urlparse, urlunparse, urljoin, urlencode, parse_qs
 from playwright.async_api import async_playwright
@@ -15,14 +22,90 @@ from playwright.async_api import async_playwright
 # File paths
 # -----------------------
 cookies_path = Path("cookies.json")
-output_csv = Path("linkedin_results.csv")
+cache_path = Path("profile_cache.sqlite")
+jobs_dir = Path("jobs")
+browser_profile_dir = Path("browser_profile")
 
 # Constants to reduce duplication
-SCROLL_HEIGHT_JS = "document.body.scrollHeight"
-SCROLL_BY_JS = "window.scrollBy(0, {})"
-SCROLL_TO_TOP_JS = "window.scrollTo(0, 0)"
 SCROLL_TO_BOTTOM_JS = "window.scrollTo(0, document.body.scrollHeight)"
 
+# Readiness selectors
+LIST_ITEM_SELECTOR = "li.pvs-list__paged-list-item"
+SEARCH_RESULT_SELECTOR = ".reusable-search__result-container, .entity-result, .search-result, .search-entity-card"
+
+# LinkedIn stops serving people search results after page 100
+MAX_SEARCH_PAGES = 100
+# Results on a full people search page; the first page's prefetch decision assumes it.
+SEARCH_RESULTS_PER_PAGE = 10
+
+# Concurrency defaults
+DEFAULT_CONCURRENCY = 3
+DEFAULT_REQUESTS_PER_MINUTE = 20
+
+# Adaptive pacing (AIMD): page loads/min start at the requested rate, grow by
+# RATE_INCREASE_RPM per healthy response up to the ceiling, and are cut by
+# the decrease factor on throttling signals (429, checkpoint/challenge or
+# login redirects) or empty results.
+MIN_REQUESTS_PER_MINUTE = 2
+DEFAULT_MAX_REQUESTS_PER_MINUTE = 40
+RATE_INCREASE_RPM = 0.5
+THROTTLE_DECREASE_FACTOR = 0.5
+EMPTY_DECREASE_FACTOR = 0.8
+THROTTLE_COOLDOWN_SECONDS = 60
+
+# Extraction modes: "dom" walks rendered nodes, "network" parses voyager JSON
+# responses and falls back to the DOM for anything it could not capture,
+# "main" reads sections off the main profile page and only opens a
+# /details/ page for sections cut short by a "Show all" link.
+EXTRACTION_MODES = ("dom", "network", "main")
+
+# Requests the extractors never read; aborted by ResourcePolicy.
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+DEFAULT_BLOCKED_URL_PATTERNS = (
+    r"linkedin\.com/li/track",
+    r"linkedin\.com/sensorCollect",
+    r"px\.ads\.linkedin\.com",
+    r"/tscp-serving/",
+    r"doubleclick\.net",
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+)
+# Typical transfer sizes, used to estimate the bytes an aborted request saved.
+ESTIMATED_RESOURCE_BYTES = {"image": 35_000, "media": 400_000, "font": 50_000}
+ESTIMATED_OTHER_BYTES = 2_000
+
+# Session states reported by setup_browser when it cannot prompt for a login.
+SESSION_OK = "ok"
+SESSION_LOGIN_REQUIRED = "login_required"
+SESSION_CHALLENGE = "challenge"
+
+# Process exit code for each status main() can return, so a headless caller
+# can tell a dead session apart from a finished run; unexpected errors exit 1.
+EXIT_CODES = {
+    SESSION_OK: 0,
+    "no_profiles": 0,
+    "invalid_url": 2,
+    SESSION_LOGIN_REQUIRED: 3,
+    SESSION_CHALLENGE: 4,
+}
+
+# Profile cache defaults; "refresh" re-scrapes everything but still writes the cache,
+# "incremental" re-scrapes a profile whose search card changed and keeps one whose
+# card is unchanged for up to DEFAULT_CARD_CACHE_TTL_HOURS.
+DEFAULT_CACHE_TTL_HOURS = 24 * 7
+DEFAULT_CARD_CACHE_TTL_HOURS = 24 * 90
+CACHE_POLICIES = ("use", "refresh", "incremental", "off")
+
+# Pause (min, max ms) each worker takes between profiles. "adaptive" adds no
+# pause and leaves pacing entirely to the adaptive rate limiter.
+DELAY_PROFILES = {
+    "adaptive": (0, 0),
+    "careful": (7000, 13000),
+    "normal": (4000, 8000),
+    "fast": (1500, 3000),
+}
+DEFAULT_DELAY_PROFILE = "adaptive"
+
 # -----------------------
 # Helpers
 # -----------------------
@@ -46,34 +129,91 @@ def ask_question(prompt_text: str) -> str:
     return input(prompt_text)
 
 async def delay(ms: int):
-    await asyncio.sleep(ms / 1000)
-
-def save_to_csv(rows, role_name):
-    # Use role name in filename
+    with run_metrics.measure("delay"):
+        await asyncio.sleep(ms / 1000)
+
+def resolve_delay_profile(delay_profile):
+    """Name from DELAY_PROFILES or an explicit (min_ms, max_ms) pair."""
+    if isinstance(delay_profile, str):
+        if delay_profile not in DELAY_PROFILES:
+            raise ValueError(f"Unknown delay profile {delay_profile!r}; choose from {', '.join(DELAY_PROFILES)}")
+        return DELAY_PROFILES[delay_profile]
+    low, high = delay_profile
+    return int(low), int(max(low, high))
+
+# Result key -> output column, in column order.
+OUTPUT_FIELDS = {
+    "name": "Name",
+    "title": "Title",
+    "location": "Location",
+    "education": "Education",
+    "url": "Profile URL",
+    "total_experience": "Total Experience",
+    "experience_details": "Experience Details",
+    "skills": "Skills"
+}
+# Fields read off the main profile's top card; the rest each need a section.
+TOP_CARD_FIELDS = ("name", "title", "location")
+FIELD_SECTIONS = {
+    "education": "education",
+    "total_experience": "experience",
+    "experience_details": "experience",
+    "skills": "skills"
+}
+
+def resolve_fields(fields=None):
+    """Requested result keys in column order; None or empty means all of them.
+
+    Accepts a list or a comma-separated string. The profile URL is always
+    included so rows can be joined back to their profile.
+    """
+    if not fields:
+        return tuple(OUTPUT_FIELDS)
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    wanted = {f.strip() for f in fields if f and f.strip()}
+    unknown = wanted - set(OUTPUT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s) {', '.join(sorted(unknown))}; choose from {', '.join(OUTPUT_FIELDS)}")
+    wanted.add("url")
+    return tuple(f for f in OUTPUT_FIELDS if f in wanted)
+
+def resolve_card_fields(fields=None):
+    """Like resolve_fields() for cards_only runs, which only have the top-card fields."""
+    if not fields:
+        return TOP_CARD_FIELDS + ("url",)
+    fields = resolve_fields(fields)
+    deep = [f for f in fields if f not in TOP_CARD_FIELDS and f != "url"]
+    if deep:
+        raise ValueError(f"Search cards only show {', '.join(TOP_CARD_FIELDS)}; "
+                         f"{', '.join(deep)} need profile visits")
+    return fields
+
+def plan_profile_visits(fields=None, extraction="dom"):
+    """Pages scrape_profile has to load for `fields`: "profile" and/or section names.
+
+    The main profile is skipped when no top-card field is asked for, unless
+    extraction="main" reads the sections off it.
+    """
+    fields = resolve_fields(fields)
+    sections = [s for s in ("education", "experience", "skills")
+                if any(FIELD_SECTIONS.get(f) == s for f in fields)]
+    needs_profile = extraction == "main" or any(f in TOP_CARD_FIELDS for f in fields)
+    return (["profile"] if needs_profile else []) + sections
+
+def output_headers(fields=None):
+    return [OUTPUT_FIELDS[f] for f in resolve_fields(fields)]
+
+def to_output_row(r, fields=None):
+    return {
+        OUTPUT_FIELDS[f]: r.get(f, "" if f == "url" else "N/A")
+        for f in resolve_fields(fields)
+    }
+
+def output_path_for(role_name, extension="csv"):
     role_clean = re.sub(r'[^\w\s-]', '', role_name).strip()
     role_clean = re.sub(r'[-\s]+', '_', role_clean)
-    output_file = Path(f"linkedin_{role_clean.lower()}_results.csv")
-    
-    headers = [
-        "Name", "Title", "Location", "Education", "Profile URL",
-        "Total Experience", "Experience Details", "Skills"
-    ]
-    with open(output_file, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow({
-                "Name": r.get("name", "N/A"),
-                "Title": r.get("title", "N/A"),
-                "Location": r.get("location", "N/A"),
-                "Education": r.get("education", "N/A"),
-                "Profile URL": r.get("url", ""),
-                "Total Experience": r.get("total_experience", "N/A"),
-                "Experience Details": r.get("experience_details", "N/A"),
-                "Skills": r.get("skills", "N/A")
-            })
-    print(f"✅ Data saved to {output_file}")
-    return output_file
+    return Path(f"linkedin_{role_clean.lower()}_results.{extension}")
 
 def open_excel(file_path):
     try:
@@ -87,24 +227,92 @@ def open_excel(file_path):
     except Exception as e:
         print(f"❌ Could not open Excel: {e}")
 
-async def auto_scroll(page, step=600, max_rounds=30, wait_ms=1500):
-    """Slow incremental scroll to trigger lazy-load."""
+AUTO_SCROLL_INSTALL_JS = r"""() => {
+    if (window.__liAutoScroll) return true;
+    window.__liAutoScroll = ({ step, maxRounds, maxQuietMs, minQuietMs, selector }) => new Promise((resolve) => {
+        const start = performance.now();
+        const ceilingMs = maxRounds * maxQuietMs;
+        const itemCount = () => selector ? document.querySelectorAll(selector).length : 0;
+        const atBottom = () => window.innerHeight + window.scrollY >= document.body.scrollHeight - 2;
+
+        let lastHeight = document.body.scrollHeight;
+        let lastCount = itemCount();
+        let lastGrowth = start;
+        let quietSince = start;
+        let rounds = 0;
+        const gaps = [];
+
+        // Quiet window adapts to how fast this page has been appending content.
+        const quietWindow = () => {
+            if (!gaps.length) return Math.max(minQuietMs, maxQuietMs / 2);
+            const avg = gaps.reduce((a, b) => a + b, 0) / gaps.length;
+            return Math.min(maxQuietMs, Math.max(minQuietMs, avg * 2));
+        };
+
+        const observer = new MutationObserver(() => {
+            const height = document.body.scrollHeight;
+            const count = itemCount();
+            if (height > lastHeight || count > lastCount) {
+                const now = performance.now();
+                gaps.push(now - lastGrowth);
+                lastGrowth = now;
+                quietSince = now;
+                lastHeight = height;
+                lastCount = count;
+            }
+        });
+        observer.observe(document.body, { childList: true, subtree: true });
+
+        const timer = setInterval(() => {
+            const now = performance.now();
+            const settled = now - quietSince >= quietWindow();
+            if ((atBottom() || rounds >= maxRounds) && settled || now - start >= ceilingMs) {
+                clearInterval(timer);
+                observer.disconnect();
+                resolve({ rounds, items: itemCount(), height: document.body.scrollHeight, elapsed: now - start });
+                return;
+            }
+            if (rounds < maxRounds && !atBottom()) {
+                window.scrollBy(0, step);
+                rounds += 1;
+                if (atBottom()) quietSince = performance.now();
+            }
+        }, 100);
+    });
+    return true;
+}"""
+
+AUTO_SCROLL_CALL_JS = "(options) => window.__liAutoScroll ? window.__liAutoScroll(options) : null"
+
+async def install_page_scripts(context):
+    """Register in-page helpers once per context so every page gets them on load."""
+    await context.add_init_script(script=f"({AUTO_SCROLL_INSTALL_JS})();")
+    await context.add_init_script(script=f"({EXTRACTOR_INSTALL_JS})();")
+
+async def auto_scroll(page, step=600, max_rounds=30, wait_ms=1500, selector=None):
+    """Scroll in-page until lazy-loading stops, in a single round-trip.
+
+    The injected driver scrolls by `step` and watches DOM growth itself; it
+    resolves once the page is at the bottom and no new content (or `selector`
+    items) has arrived within an adaptive quiet window capped at `wait_ms`.
+    """
+    options = {
+        "step": step,
+        "maxRounds": max_rounds,
+        "maxQuietMs": wait_ms,
+        "minQuietMs": min(400, wait_ms),
+        "selector": selector
+    }
     try:
-        last_height = await page.evaluate(f"() => {SCROLL_HEIGHT_JS}")
-        rounds = 0
-        while rounds < max_rounds:
-            rounds += 1
-            await page.evaluate(SCROLL_BY_JS.format(step))
-            await page.wait_for_timeout(wait_ms)
-            new_height = await page.evaluate(f"() => {SCROLL_HEIGHT_JS}")
-            if new_height == last_height:
-                await page.evaluate("window.scrollBy(0, 50);")
-                await page.wait_for_timeout(wait_ms)
-                new_height = await page.evaluate(f"() => {SCROLL_HEIGHT_JS}")
-                if new_height == last_height:
-                    break
-            last_height = new_height
-        print("ℹ Scrolled page to load dynamic content.")
+        with run_metrics.measure("scroll"):
+            outcome = await page.evaluate(AUTO_SCROLL_CALL_JS, options)
+            if outcome is None:
+                # Context was created without install_page_scripts(): inject now.
+                run_metrics.count("scroll_script_reinstalls")
+                await page.evaluate(AUTO_SCROLL_INSTALL_JS)
+                outcome = await page.evaluate(AUTO_SCROLL_CALL_JS, options)
+        print(f"ℹ Scrolled page to load dynamic content "
+              f"({outcome['rounds']} steps, {outcome['items']} items, {outcome['elapsed']/1000:.1f}s).")
     except Exception as e:
         print(f"❌ Failed to scroll: {e}")
 
@@ -125,24 +333,1160 @@ def clean_profile_url(u: str) -> str:
     except Exception:
         return u
 
+def failed_result(url, name="N/A"):
+    return {
+        "name": name, "title": "N/A", "location": "N/A",
+        "education": "N/A", "url": clean_profile_url(url),
+        "total_experience": "N/A", "experience_details": "N/A",
+        "skills": "N/A"
+    }
+
+def card_result(card):
+    """Result row for a search result card, shaped like scrape_profile's."""
+    return {
+        "name": card.get("name") or "", "title": card.get("title") or "N/A",
+        "location": card.get("location") or "", "url": clean_profile_url(card["url"])
+    }
+
+def search_card_hash(card):
+    """Hash of the headline and location a search card (or result) shows, or None if both are empty."""
+    parts = [" ".join(str(card.get(key) or "").split()).lower() for key in ("title", "location")]
+    parts = ["" if part == "n/a" else part for part in parts]
+    if not any(parts):
+        return None
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+def card_hash_recorder(card_hashes):
+    """on_card callback for collect_search_profile_urls that fills `card_hashes` by clean URL."""
+    def record(card):
+        card_hash = search_card_hash(card)
+        if card_hash:
+            card_hashes[clean_profile_url(card["url"])] = card_hash
+    return record
+
+def is_failed_result(result):
+    return not result or result.get("name") in ("N/A", "Failed to scrape")
+
+@contextmanager
+def timed(timings, stage):
+    """Add the wall time of the block (seconds) to `timings[stage]` if `timings` is a dict."""
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[stage] = round(timings.get(stage, 0.0) + time.monotonic() - started, 3)
+
+# -----------------------
+# Run metrics
+# -----------------------
+# Samples kept per stage; older samples drop out of the percentiles.
+METRICS_SAMPLE_LIMIT = 5000
+METRICS_QUANTILES = (0.5, 0.95, 0.99)
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+class RunMetrics:
+    """Stage durations, per-profile timings, counters and gauges for a process.
+
+    Low-level stages (rate_limit_wait, goto, readiness_wait, scroll, extract,
+    delay) are observed where they happen; each finished profile adds its
+    total time and its scrape_profile sections as profile.<section>.
+    Thread-safe, so the UI server can read it while a job runs.
+    """
+
+    def __init__(self, sample_limit=METRICS_SAMPLE_LIMIT):
+        self.sample_limit = sample_limit
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.samples = {}
+            self.totals = {}
+            self.counters = {}
+            self.gauges = {}
+            self.profiles = deque(maxlen=self.sample_limit)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            self.samples.setdefault(stage, deque(maxlen=self.sample_limit)).append(seconds)
+            count, total = self.totals.get(stage, (0, 0.0))
+            self.totals[stage] = (count + 1, total + seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    @contextmanager
+    def measure(self, stage):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.monotonic() - started)
+
+    def record_profile(self, url, seconds, timings, failed, source):
+        self.count(f"profiles_{source}")
+        if failed:
+            self.count("profiles_failed")
+        if source != "scraped":
+            return
+        self.observe("profile", seconds)
+        for section, section_seconds in (timings or {}).items():
+            self.observe(f"profile.{section}", section_seconds)
+        with self._lock:
+            self.profiles.append({"url": url, "seconds": round(seconds, 3), "failed": failed, "timings": timings})
+
+    def summary(self):
+        """{"stages": {stage: count/sum/mean/p50/p95/p99}, "counters", "gauges", "profiles"}"""
+        with self._lock:
+            stages = {}
+            for stage, values in self.samples.items():
+                ordered = sorted(values)
+                count, total = self.totals[stage]
+                stats = {"count": count, "sum": round(total, 3), "mean": round(total / count, 3)}
+                for q in METRICS_QUANTILES:
+                    stats[f"p{int(q * 100)}"] = round(percentile(ordered, q), 3)
+                stages[stage] = stats
+            return {
+                "started": self.started,
+                "elapsed": round(time.time() - self.started, 3),
+                "stages": stages,
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "profiles": list(self.profiles)
+            }
+
+    def to_prometheus(self, prefix="linkedin_scraper"):
+        """Prometheus text exposition of the stage summaries and counters."""
+        summary = self.summary()
+        lines = [f"# HELP {prefix}_stage_seconds Duration of scraper stages.",
+                 f"# TYPE {prefix}_stage_seconds summary"]
+        for stage, stats in sorted(summary["stages"].items()):
+            for q in METRICS_QUANTILES:
+                lines.append(f'{prefix}_stage_seconds{{stage="{stage}",quantile="{q}"}} '
+                             f'{stats[f"p{int(q * 100)}"]}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {stats["sum"]}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        lines += [f"# HELP {prefix}_events_total Profile outcomes, fallbacks and retries.",
+                  f"# TYPE {prefix}_events_total counter"]
+        for name, value in sorted(summary["counters"].items()):
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+        for name, value in sorted(summary["gauges"].items()):
+            lines += [f"# TYPE {prefix}_{name} gauge", f"{prefix}_{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def print_report(self):
+        summary = self.summary()
+        if not summary["stages"]:
+            return
+        print("\n📈 Stage timings (seconds):")
+        print(f"   {'stage':<24} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'total':>9}")
+        for stage, stats in sorted(summary["stages"].items()):
+            print(f"   {stage:<24} {stats['count']:>6} {stats['p50']:>8.2f} {stats['p95']:>8.2f} "
+                  f"{stats['p99']:>8.2f} {stats['sum']:>9.1f}")
+        if summary["counters"]:
+            print("   " + ", ".join(f"{name}={value}" for name, value in sorted(summary["counters"].items())))
+
+run_metrics = RunMetrics()
+
+# -----------------------
+# Profile result cache
+# -----------------------
+class ProfileCache:
+    """SQLite cache of scrape_profile results keyed by clean_profile_url().
+
+    Each entry also keeps the search_card_hash() of the card the profile was
+    found through, so an incremental refresh reuses a fresh entry only while
+    the card still shows the same headline and location.
+    """
+
+    def __init__(self, path=cache_path, ttl_hours=DEFAULT_CACHE_TTL_HOURS, refresh=False,
+                 card_ttl_hours=DEFAULT_CARD_CACHE_TTL_HOURS):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_hours * 3600
+        self.card_ttl_seconds = card_ttl_hours * 3600
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            "url TEXT PRIMARY KEY, data TEXT NOT NULL, scraped_at REAL NOT NULL, card_hash TEXT)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(profiles)")}
+        # Caches written before incremental refresh and field selection existed.
+        if "card_hash" not in columns:
+            self._conn.execute("ALTER TABLE profiles ADD COLUMN card_hash TEXT")
+        if "field_times" not in columns:
+            self._conn.execute("ALTER TABLE profiles ADD COLUMN field_times TEXT")
+        self._conn.commit()
+
+    def _entry(self, url):
+        """(data, {field: scraped_at}, card_hash) stored for `url`, or None."""
+        row = self._conn.execute(
+            "SELECT data, scraped_at, card_hash, field_times FROM profiles WHERE url = ?",
+            (clean_profile_url(url),)
+        ).fetchone()
+        if row is None:
+            return None
+        data = json.loads(row[0])
+        times = json.loads(row[3]) if row[3] else {}
+        # Fields without their own time were written together with the row.
+        return data, {f: times.get(f, row[1]) for f in data}, row[2]
+
+    def get(self, url, fields=None, card_hash=None):
+        """Cached `fields` of `url` if each is within the TTL; the longer card TTL if `card_hash` still matches."""
+        fields = resolve_fields(fields)
+        entry = None if self.refresh else self._entry(url)
+        max_age = self.ttl_seconds
+        if entry is not None and card_hash is not None:
+            data, _, stored_hash = entry
+            # Older entries have no card hash; their own headline and location stand in.
+            if card_hash != (stored_hash or search_card_hash(data)):
+                entry = None
+            else:
+                max_age = max(self.ttl_seconds, self.card_ttl_seconds)
+        now = time.time()
+        if entry is None or any(f not in entry[0] or now - entry[1][f] > max_age for f in fields):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {f: entry[0][f] for f in fields}
+
+    def put(self, url, result, card_hash=None):
+        """Merge `result` into the entry; only its fields get a new time, and a missing `card_hash` keeps the old one."""
+        if is_failed_result(result):
+            return
+        data, times, stored_hash = self._entry(url) or ({}, {}, None)
+        now = time.time()
+        data = {**data, **result}
+        times = {**times, **{f: now for f in result}}
+        self._conn.execute(
+            "INSERT OR REPLACE INTO profiles (url, data, scraped_at, card_hash, field_times) VALUES (?, ?, ?, ?, ?)",
+            (clean_profile_url(url), json.dumps(data, ensure_ascii=False), now, card_hash or stored_hash,
+             json.dumps(times))
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+def check_job_options(cache, delay_profile, extraction="dom"):
+    """Validate the options every job runner takes; returns the worker delay range."""
+    if cache not in CACHE_POLICIES:
+        raise ValueError(f"Unknown cache policy {cache!r}; choose from {', '.join(CACHE_POLICIES)}")
+    if extraction not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown extraction mode {extraction!r}; choose from {', '.join(EXTRACTION_MODES)}")
+    return resolve_delay_profile(delay_profile)
+
+@contextmanager
+def open_profile_cache(cache, ttl_hours=DEFAULT_CACHE_TTL_HOURS, card_ttl_hours=DEFAULT_CARD_CACHE_TTL_HOURS):
+    """ProfileCache for a cache policy (None when "off"), closed with a hit/miss summary."""
+    if cache == "off":
+        yield None
+        return
+    profile_cache = ProfileCache(ttl_hours=ttl_hours, refresh=cache == "refresh", card_ttl_hours=card_ttl_hours)
+    try:
+        yield profile_cache
+    finally:
+        print(f"💾 Profile cache: {profile_cache.hits} hits, {profile_cache.misses} misses")
+        profile_cache.close()
+
+# -----------------------
+# Streaming output sinks
+# -----------------------
+class CsvSink:
+    """Append each row to a CSV file as soon as it is produced."""
+    extension = "csv"
+
+    def __init__(self, path, fields=None):
+        self.path = Path(path)
+        self.rows = 0
+        self.fields = resolve_fields(fields)
+        self._file = open(self.path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=output_headers(self.fields))
+        self._writer.writeheader()
+        self._file.flush()
+
+    def write(self, result):
+        self._writer.writerow(to_output_row(result, self.fields))
+        self._file.flush()
+        self.rows += 1
+
+    def close(self):
+        self._file.close()
+
+class JsonlSink:
+    """One JSON object per line, keyed by the CSV headers."""
+    extension = "jsonl"
+
+    def __init__(self, path, fields=None):
+        self.path = Path(path)
+        self.rows = 0
+        self.fields = resolve_fields(fields)
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def write(self, result):
+        self._file.write(json.dumps(to_output_row(result, self.fields), ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.rows += 1
+
+    def close(self):
+        self._file.close()
+
+class ParquetSink:
+    """Parquet writer that flushes a row group every `batch_size` rows.
+
+    Needs pyarrow. Memory is bounded by one batch; the file only becomes
+    readable once closed, so use CSV or JSONL to watch a run in progress.
+    """
+    extension = "parquet"
+
+    def __init__(self, path, batch_size=200, fields=None):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow")
+        self.path = Path(path)
+        self.rows = 0
+        self.batch_size = batch_size
+        self.fields = resolve_fields(fields)
+        self._headers = output_headers(self.fields)
+        self._pa = pa
+        self._schema = pa.schema([(h, pa.string()) for h in self._headers])
+        self._writer = pq.ParquetWriter(str(self.path), self._schema)
+        self._batch = []
+
+    def write(self, result):
+        self._batch.append(to_output_row(result, self.fields))
+        self.rows += 1
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._batch:
+            return
+        columns = {h: [str(row.get(h, "")) for row in self._batch] for h in self._headers}
+        self._writer.write_table(self._pa.table(columns, schema=self._schema))
+        self._batch = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+OUTPUT_SINKS = {"csv": CsvSink, "jsonl": JsonlSink, "parquet": ParquetSink}
+
+def open_sink(role_name, output_format="csv", fields=None):
+    sink_class = OUTPUT_SINKS.get(output_format)
+    if sink_class is None:
+        raise ValueError(f"Unknown output format {output_format!r}; choose from {', '.join(OUTPUT_SINKS)}")
+    return sink_class(output_path_for(role_name, sink_class.extension), fields=fields)
+
+# -----------------------
+# Resumable job journal
+# -----------------------
+def new_job_id():
+    return time.strftime("%Y%m%d-%H%M%S") + f"-{random.randint(0, 0xffff):04x}"
+
+class JobJournal:
+    """Append-only JSONL checkpoint of a scrape job.
+
+    Records the job parameters, the URL list from collect_search_profile_urls
+    (URL by URL in pipeline mode) and every scrape_profile result as soon as it finishes, so a crashed or
+    interrupted run can be resumed with the same job id. Failed profiles are
+    retried on resume.
+    """
+
+    def __init__(self, job_id, directory=jobs_dir):
+        self.job_id = job_id
+        self.path = Path(directory) / f"{job_id}.jsonl"
+        self.search_url = None
+        self.role_name = None
+        self.limit = None
+        self.fields = None
+        self.cards_only = False
+        self.urls = None
+        self.results = {}
+        if self.path.exists():
+            self._load()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn last line from a crash mid-write.
+                    continue
+                kind = record.get("type")
+                if kind == "job":
+                    self.search_url = record.get("search_url")
+                    self.role_name = record.get("role_name")
+                    self.limit = record.get("limit")
+                    self.fields = record.get("fields")
+                    self.cards_only = bool(record.get("cards_only"))
+                elif kind == "urls":
+                    self.urls = record.get("urls") or []
+                elif kind == "url":
+                    self.urls = (self.urls or []) + [record["url"]]
+                elif kind == "result":
+                    self.results[clean_profile_url(record["url"])] = record["result"]
+
+    def _append(self, record):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def completed(self):
+        """Results that do not need to be scraped again, keyed by clean URL."""
+        return {url: r for url, r in self.results.items() if not is_failed_result(r)}
+
+    def record_job(self, search_url, role_name, limit, fields=None, cards_only=False):
+        self.search_url, self.role_name, self.limit = search_url, role_name, limit
+        self.fields = list(fields) if fields else None
+        self.cards_only = cards_only
+        self._append({"type": "job", "search_url": search_url, "role_name": role_name, "limit": limit,
+                      "fields": self.fields, "cards_only": cards_only, "created_at": time.time()})
+
+    def record_urls(self, urls):
+        self.urls = list(urls)
+        self._append({"type": "urls", "urls": self.urls})
+
+    def record_url(self, url):
+        self.urls = (self.urls or []) + [url]
+        self._append({"type": "url", "url": url})
+
+    def record_result(self, url, result):
+        key = clean_profile_url(url)
+        if key in self.results and self.results[key] == result:
+            return
+        self.results[key] = result
+        self._append({"type": "result", "url": url, "result": result})
+
+# -----------------------
+# Readiness detection
+# -----------------------
+WAIT_FOR_READY_JS = r"""({ selector, quietMs, timeoutMs }) => new Promise((resolve) => {
+    const start = performance.now();
+    const count = () => selector ? document.querySelectorAll(selector).length : 0;
+    let lastCount = count();
+    let lastChange = start;
+
+    const observer = new MutationObserver(() => {
+        if (!selector) lastChange = performance.now();
+    });
+    observer.observe(document.body || document.documentElement, { childList: true, subtree: true });
+
+    const timer = setInterval(() => {
+        const now = performance.now();
+        const current = count();
+        if (current !== lastCount) {
+            lastCount = current;
+            lastChange = now;
+        }
+        const quiet = now - lastChange >= quietMs;
+        const ready = quiet && (!selector || current > 0);
+        if (ready || now - start >= timeoutMs) {
+            clearInterval(timer);
+            observer.disconnect();
+            resolve({ ready, count: current, elapsed: now - start });
+        }
+    }, 100);
+})"""
+
+# stage -> {"calls", "ready", "waited_ms", "saved_ms"}
+readiness_stats = {}
+
+async def wait_until_ready(page, stage, fallback_ms, selector=None, quiet_ms=700):
+    """Wait for the page to settle instead of sleeping a fixed `fallback_ms`.
+
+    With a `selector`, the page is ready once the number of matching nodes stops
+    changing for `quiet_ms`; without one, once a MutationObserver sees no DOM
+    changes for `quiet_ms`. `fallback_ms` (the old fixed sleep) is the ceiling.
+    """
+    started = time.monotonic()
+    ready = False
+    try:
+        outcome = await call_page_function(page, "waitForReady", {
+            "selector": selector,
+            "quietMs": quiet_ms,
+            "timeoutMs": fallback_ms
+        })
+        ready = bool(outcome.get("ready"))
+    except Exception:
+        # Page navigated away or the script was blocked: sleep out the remainder.
+        remaining = fallback_ms - (time.monotonic() - started) * 1000
+        if remaining > 0:
+            await page.wait_for_timeout(remaining)
+
+    waited_ms = (time.monotonic() - started) * 1000
+    run_metrics.observe("readiness_wait", waited_ms / 1000)
+    if not ready:
+        run_metrics.count("readiness_timeouts")
+    stats = readiness_stats.setdefault(stage, {"calls": 0, "ready": 0, "waited_ms": 0.0, "saved_ms": 0.0})
+    stats["calls"] += 1
+    stats["ready"] += int(ready)
+    stats["waited_ms"] += waited_ms
+    stats["saved_ms"] += max(0.0, fallback_ms - waited_ms)
+    return ready
+
+def print_readiness_report():
+    if not readiness_stats:
+        return
+    print("\n⏱️ Readiness waits (time saved vs fixed sleeps):")
+    total_saved = 0.0
+    for stage, stats in sorted(readiness_stats.items()):
+        total_saved += stats["saved_ms"]
+        print(f"   {stage:<20} calls={stats['calls']:<4} ready={stats['ready']:<4} "
+              f"waited={stats['waited_ms']/1000:.1f}s saved={stats['saved_ms']/1000:.1f}s")
+    print(f"   {'total':<20} saved={total_saved/1000:.1f}s")
+
+# -----------------------
+# Extractor registry
+# -----------------------
+# Name, headline and location from the profile top card.
+EXTRACT_TOP_CARD_JS = r"""() => {
+    const getText = (selectors) => {
+        for (const sel of selectors) {
+            const el = document.querySelector(sel);
+            if (el && el.innerText && el.innerText.trim()) return el.innerText.trim();
+        }
+        return "N/A";
+    };
+
+    const name = getText([
+        "h1.inline.t-24.v-align-middle.break-words",
+        "h1.text-heading-xlarge",
+        "h1"
+    ]);
+    const title = getText([
+        "div.text-body-medium.break-words",
+        "div.text-body-medium",
+        ".mt1.t-18.t-black.t-normal.break-words"
+    ]);
+    const location = getText([
+        "span.text-body-small.inline.t-black--light.break-words",
+        "span.text-body-small"
+    ]);
+
+    return {
+        name,
+        title,
+        location
+    };
+}"""
+
+# First school-like name on /details/education/.
+EXTRACT_EDUCATION_JS = r"""(options) => {
+    let collegeName = "";
+
+    const eduItems = sectionItems(options && options.section);
+
+    for (const item of eduItems) {
+        try {
+            const schoolNameEl = item.querySelector('.hoverable-link-text.t-bold span[aria-hidden="true"]');
+            if (schoolNameEl) {
+                const schoolText = schoolNameEl.innerText.trim();
+
+                if (schoolText &&
+                    schoolText.length > 5 &&
+                    (schoolText.toLowerCase().includes('university') ||
+                     schoolText.toLowerCase().includes('college') ||
+                     schoolText.toLowerCase().includes('institute') ||
+                     schoolText.includes('IIT') ||
+                     schoolText.includes('NIT') ||
+                     schoolText.includes('IIIT') ||
+                     schoolText.includes('BITS') ||
+                     schoolText.toLowerCase().includes('school')) &&
+                    !schoolText.toLowerCase().includes('company') &&
+                    !schoolText.toLowerCase().includes('pvt') &&
+                    !schoolText.toLowerCase().includes('ltd') &&
+                    !schoolText.toLowerCase().includes('technologies') &&
+                    !schoolText.toLowerCase().includes('solutions')) {
+
+                    collegeName = schoolText;
+                    break;
+                }
+            }
+        } catch (e) {
+            continue;
+        }
+    }
+
+    return collegeName || "";
+}"""
+
+# Deduplicated skill names on /details/skills/.
+EXTRACT_SKILLS_JS = r"""(options) => {
+    const skillsList = [];
+    const seenSkills = new Set();
+
+    const skillItems = sectionItems(options && options.section);
+
+    skillItems.forEach((item) => {
+        try {
+            const skillNameEl = item.querySelector('.hoverable-link-text.t-bold span[aria-hidden="true"]');
+            if (skillNameEl) {
+                const skillText = skillNameEl.innerText.trim();
+
+                if (skillText &&
+                    skillText.length > 1 &&
+                    skillText.length < 50 &&
+                    !skillText.match(/^\d+/) &&
+                    !skillText.includes('experience') &&
+                    !skillText.includes('company') &&
+                    !skillText.includes('at ') &&
+                    !skillText.includes(' at ') &&
+                    !skillText.includes('|') &&
+                    !skillText.includes('endorsement') &&
+                    !skillText.includes('connection') &&
+                    !skillText.toLowerCase().includes('passed') &&
+                    !skillText.toLowerCase().includes('linkedin') &&
+                    !skillText.toLowerCase().includes('skill assessment') &&
+                    skillText !== '·') {
+
+                    if (!seenSkills.has(skillText.toLowerCase())) {
+                        skillsList.push(skillText);
+                        seenSkills.add(skillText.toLowerCase());
+                    }
+                }
+            }
+        } catch (e) {
+            // Continue if there's an error with this item
+        }
+    });
+
+    return skillsList;
+}"""
+
+# Positions, current role and summed duration on /details/experience/.
+EXTRACT_EXPERIENCE_JS = r"""(options) => {
+    const experiences = [];
+    let currentCompany = "N/A";
+    let currentTitle = "N/A";
+    let totalExperience = "N/A";
+
+    const experienceItems = sectionItems(options && options.section);
+
+    experienceItems.forEach((item) => {
+        try {
+            let title = "N/A";
+            let company = "N/A";
+            let duration = "N/A";
+            let employmentType = "";
+
+            const titleSelectors = [
+                'div.display-flex.align-items-center span[aria-hidden="true"]',
+                'div.hoverable-link-text.t-bold span[aria-hidden="true"]',
+                '.pvs-entity__summary-info .hoverable-link-text span[aria-hidden="true"]',
+                'a[data-field*="experience"] span[aria-hidden="true"]',
+                '.t-bold span[aria-hidden="true"]'
+            ];
+
+            for (const selector of titleSelectors) {
+                const titleEl = item.querySelector(selector);
+                if (titleEl && titleEl.textContent && titleEl.textContent.trim()) {
+                    const titleText = titleEl.textContent.trim();
+                    if (!titleText.match(/\d+\s*(yr|mo|year|month)/i) &&
+                        titleText.length < 100 &&
+                        !titleText.includes('·')) {
+                        title = titleText;
+                        break;
+                    }
+                }
+            }
+
+            const companySelectors = [
+                '.pvs-entity__sub-components .hoverable-link-text span[aria-hidden="true"]',
+                '.t-14.t-normal span[aria-hidden="true"]',
+                '.pvs-entity__summary-info .t-14 span[aria-hidden="true"]'
+            ];
+
+            for (const selector of companySelectors) {
+                const companyEl = item.querySelector(selector);
+                if (companyEl && companyEl.textContent && companyEl.textContent.trim()) {
+                    const companyText = companyEl.textContent.trim();
+                    if (!companyText.match(/Full-time|Part-time|Contract|Internship|Freelance|Self-employed|Temporary|\d+\s*(yr|mo)/i) &&
+                        !companyText.includes('·') &&
+                        companyText.length > 2) {
+                        company = companyText;
+                        break;
+                    }
+                }
+            }
+
+            const durationSelectors = [
+                '.pvs-entity__caption-wrapper',
+                '.t-12.t-normal span[aria-hidden="true"]',
+                '.pvs-entity__sub-components .t-12 span[aria-hidden="true"]'
+            ];
+
+            for (const selector of durationSelectors) {
+                const durationEl = item.querySelector(selector);
+                if (durationEl && durationEl.textContent && durationEl.textContent.trim()) {
+                    const durationText = durationEl.textContent.trim();
+                    if (durationText.match(/\d+\s*(yr|mo|year|month)|Present|Current/i)) {
+                        duration = durationText;
+                        break;
+                    }
+                }
+            }
+
+            const subComponents = item.querySelector('.pvs-entity__sub-components');
+            if (subComponents) {
+                const companyNameEl = item.querySelector('.hoverable-link-text.t-bold span[aria-hidden="true"]');
+                const companyName = companyNameEl ? companyNameEl.textContent.trim() : "N/A";
+
+                const positions = subComponents.querySelectorAll('li.pvs-list__paged-list-item');
+                positions.forEach(position => {
+                    try {
+                        const posTitle = position.querySelector('.hoverable-link-text.t-bold span[aria-hidden="true"]');
+                        const posDuration = position.querySelector('.pvs-entity__caption-wrapper');
+                        const posType = position.querySelector('.t-14.t-normal span[aria-hidden="true"]');
+
+                        experiences.push({
+                            company: companyName,
+                            title: posTitle ? posTitle.textContent.trim() : "N/A",
+                            duration: posDuration ? posDuration.textContent.trim() : "N/A",
+                            employmentType: posType ? posType.textContent.trim() : ""
+                        });
+                    } catch (e) {
+                        console.log('Error parsing position:', e);
+                    }
+                });
+            } else {
+                if (title !== "N/A" || company !== "N/A") {
+                    experiences.push({
+                        company: company,
+                        title: title,
+                        duration: duration,
+                        employmentType: employmentType
+                    });
+                }
+            }
+
+        } catch (e) {
+            console.log('Error parsing experience item:', e);
+        }
+    });
+
+    const uniqueExperiences = [];
+    const seen = new Set();
+
+    experiences.forEach(exp => {
+        const key = `${exp.company}-${exp.title}-${exp.duration}`;
+        if (!seen.has(key) && exp.title !== "N/A" && exp.company !== "N/A") {
+            seen.add(key);
+            uniqueExperiences.push(exp);
+        }
+    });
+
+    for (const exp of uniqueExperiences) {
+        if (exp.duration && /Present|Current/i.test(exp.duration)) {
+            currentCompany = exp.company;
+            currentTitle = exp.title;
+            break;
+        }
+    }
+
+    if (currentCompany === "N/A" && uniqueExperiences.length > 0) {
+        currentCompany = uniqueExperiences[0].company;
+        currentTitle = uniqueExperiences[0].title;
+    }
+
+    let totalYears = 0;
+    let totalMonths = 0;
+
+    uniqueExperiences.forEach(exp => {
+        if (exp.duration) {
+            const yearMatch = exp.duration.match(/(\d+)\s*(yr|year)s?/i);
+            const monthMatch = exp.duration.match(/(\d+)\s*(mo|month)s?/i);
+
+            if (yearMatch) {
+                totalYears += parseInt(yearMatch[1]);
+            }
+            if (monthMatch) {
+                totalMonths += parseInt(monthMatch[1]);
+            }
+        }
+    });
+
+    totalYears += Math.floor(totalMonths / 12);
+    totalMonths = totalMonths % 12;
+
+    if (totalYears > 0 || totalMonths > 0) {
+        totalExperience = `${totalYears} yrs ${totalMonths} mos`;
+    }
+
+    return {
+        experiences: uniqueExperiences,
+        currentCompany: currentCompany,
+        currentTitle: currentTitle,
+        totalExperience: totalExperience
+    };
+}"""
+
+# Profile links on a people search results page.
+EXTRACT_SEARCH_LINKS_JS = r"""() => {
+    const profileUrls = [];
+    document.querySelectorAll("a[href*='/in/']").forEach(link => {
+        const url = profileLink(link);
+        if (url) profileUrls.push(url);
+    });
+    return [...new Set(profileUrls)];
+}"""
+
+# Name, headline and location as shown on each search result card.
+EXTRACT_SEARCH_CARDS_JS = r"""(options) => {
+    const firstText = (root, selectors) => {
+        for (const selector of selectors) {
+            const el = root.querySelector(selector);
+            const value = el ? (el.innerText || el.textContent || '').trim() : '';
+            if (value) return value.split('\n')[0].trim();
+        }
+        return '';
+    };
+    const cards = [];
+    const seen = new Set();
+    document.querySelectorAll(options.selector).forEach(card => {
+        const url = [...card.querySelectorAll("a[href*='/in/']")].map(profileLink).find(Boolean);
+        // "LinkedIn Member" cards outside the network have no profile link.
+        if (!url || seen.has(url)) return;
+        seen.add(url);
+        cards.push({
+            url,
+            name: firstText(card, ['.entity-result__title-text a span[aria-hidden="true"]',
+                                   'a[href*="/in/"] span[aria-hidden="true"]', '.entity-result__title-text']),
+            title: firstText(card, ['.entity-result__primary-subtitle', '.t-14.t-black.t-normal']),
+            location: firstText(card, ['.entity-result__secondary-subtitle', '.t-14.t-normal:not(.t-black)'])
+        });
+    });
+    return cards;
+}"""
+
+# Shown sections of the main profile page: item count and whether a
+# "Show all" link means the full list is only on /details/<section>/.
+MAIN_SECTIONS_JS = r"""() => {
+    const layout = {};
+    for (const section of ['experience', 'education', 'skills']) {
+        const root = sectionRoot(section);
+        layout[section] = root ? {
+            items: root.querySelectorAll(MAIN_ITEM_SELECTOR).length,
+            truncated: !!root.querySelector(
+                `a[href*="/details/${section}"], a[id^="navigation-index-see-all-${section}"]`)
+        } : null;
+    }
+    return layout;
+}"""
+
+# Shared by the registered functions. The education, skills and experience
+# extractors read the list items of a /details/ page by default, or those of
+# one main-profile section when called with {section}.
+EXTRACTOR_HELPERS_JS = r"""
+const EXCLUDED_LINK_PARTS = ['/miniProfile/', '/company/', '/school/', '/feed/', '/posts/', '/activity/'];
+const profileLink = (link) => {
+    const href = link.href || link.getAttribute("href") || "";
+    if (!href.includes("/in/") || EXCLUDED_LINK_PARTS.some(part => href.includes(part))) return null;
+    return href.split('?')[0];
+};
+const MAIN_ITEM_SELECTOR = 'li.artdeco-list__item, li.pvs-list__paged-list-item';
+const sectionRoot = (section) => {
+    const anchor = document.getElementById(section);
+    return anchor ? anchor.closest('section') : null;
+};
+const sectionItems = (section) => {
+    if (!section) return document.querySelectorAll('li.pvs-list__paged-list-item');
+    const root = sectionRoot(section);
+    return root ? root.querySelectorAll(MAIN_ITEM_SELECTOR) : [];
+};
+"""
+
+# Functions installed as window.__liExtract[name]. Bump EXTRACTOR_VERSION
+# whenever one of them changes so pages holding an older copy reinstall it.
+PAGE_FUNCTIONS = {
+    "topCard": EXTRACT_TOP_CARD_JS,
+    "education": EXTRACT_EDUCATION_JS,
+    "skills": EXTRACT_SKILLS_JS,
+    "experience": EXTRACT_EXPERIENCE_JS,
+    "searchLinks": EXTRACT_SEARCH_LINKS_JS,
+    "searchCards": EXTRACT_SEARCH_CARDS_JS,
+    "mainSections": MAIN_SECTIONS_JS,
+    "waitForReady": WAIT_FOR_READY_JS,
+}
+EXTRACTOR_VERSION = 3
+
+EXTRACTOR_INSTALL_JS = "() => {%s\nwindow.__liExtract = { version: %d, %s }; return true; }" % (
+    EXTRACTOR_HELPERS_JS, EXTRACTOR_VERSION,
+    ", ".join(f"{name}: ({source})" for name, source in PAGE_FUNCTIONS.items())
+)
+
+# The only source sent per call: look the function up by name and run it.
+EXTRACTOR_CALL_JS = """async ([name, version, arg]) => {
+    const registry = window.__liExtract;
+    if (!registry || registry.version !== version || !registry[name]) return { missing: true };
+    return { value: await registry[name](arg) };
+}"""
+
+async def call_page_function(page, name, arg=None):
+    """Run registered page function `name` with one small argument.
+
+    Pages of a context set up with install_page_scripts() already hold the
+    registry; anywhere else it is injected on the first miss, once per document.
+    """
+    outcome = await page.evaluate(EXTRACTOR_CALL_JS, [name, EXTRACTOR_VERSION, arg])
+    if outcome.get("missing"):
+        run_metrics.count("extractor_reinstalls")
+        await page.evaluate(EXTRACTOR_INSTALL_JS)
+        outcome = await page.evaluate(EXTRACTOR_CALL_JS, [name, EXTRACTOR_VERSION, arg])
+    return outcome.get("value")
+
+async def run_extractor(page, name, arg=None):
+    """Call a registered extractor, timed as the "extract" stage."""
+    with run_metrics.measure("extract"):
+        return await call_page_function(page, name, arg)
+
+# -----------------------
+# Rate limiting
+# -----------------------
+class RateLimiter:
+    """Adaptive (AIMD) pacing of page navigations, shared by every worker of a run.
+
+    Navigations are spaced 60/requests_per_minute seconds apart. Each healthy
+    response adds RATE_INCREASE_RPM up to `max_rpm`. A throttling signal
+    halves the rate and pauses all navigations for THROTTLE_COOLDOWN_SECONDS,
+    and an empty result trims it by EMPTY_DECREASE_FACTOR. With
+    `adaptive=False` the rate stays fixed; a rate of 0 disables pacing.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, max_rpm=DEFAULT_MAX_REQUESTS_PER_MINUTE,
+                 min_rpm=MIN_REQUESTS_PER_MINUTE, adaptive=True):
+        self.adaptive = adaptive and bool(requests_per_minute)
+        self.min_rpm = min(min_rpm, requests_per_minute or min_rpm)
+        self.max_rpm = max(max_rpm, requests_per_minute or 0)
+        self.throttle_events = 0
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+        self._set_rate(requests_per_minute)
+
+    def _set_rate(self, requests_per_minute):
+        self.requests_per_minute = requests_per_minute
+        self.min_interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        run_metrics.set_gauge("requests_per_minute", round(requests_per_minute or 0, 2))
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now = time.monotonic()
+            self._next_slot = now + self.min_interval
+
+    def record_success(self):
+        if self.adaptive and self.requests_per_minute < self.max_rpm:
+            self._set_rate(min(self.max_rpm, self.requests_per_minute + RATE_INCREASE_RPM))
+
+    def record_throttle(self, reason):
+        """Back off hard after a 429, checkpoint/challenge or login redirect."""
+        self.throttle_events += 1
+        run_metrics.count(f"throttled_{reason}")
+        if not self.adaptive:
+            return
+        self._set_rate(max(self.min_rpm, self.requests_per_minute * THROTTLE_DECREASE_FACTOR))
+        self._next_slot = max(self._next_slot, time.monotonic() + THROTTLE_COOLDOWN_SECONDS)
+        print(f"🐢 Throttling signal ({reason}): pausing {THROTTLE_COOLDOWN_SECONDS}s, "
+              f"then {self.requests_per_minute:.1f} page loads/min")
+
+    def record_empty(self):
+        """Back off gently when a page that should have content comes back empty."""
+        run_metrics.count("empty_results")
+        if self.adaptive:
+            self._set_rate(max(self.min_rpm, self.requests_per_minute * EMPTY_DECREASE_FACTOR))
+
+    def snapshot(self):
+        return {
+            "requests_per_minute": round(self.requests_per_minute or 0, 2),
+            "min_rpm": self.min_rpm,
+            "max_rpm": self.max_rpm,
+            "adaptive": self.adaptive,
+            "throttle_events": self.throttle_events
+        }
+
+rate_limiter = RateLimiter()
+
+def rate_limiter_description():
+    if not rate_limiter.requests_per_minute:
+        return "no page load limit"
+    if not rate_limiter.adaptive:
+        return f"{rate_limiter.requests_per_minute} page loads/min"
+    return (f"{rate_limiter.requests_per_minute:.1f} page loads/min, "
+            f"adapting between {rate_limiter.min_rpm} and {rate_limiter.max_rpm}")
+
+def set_rate_limit(requests_per_minute, max_rpm=DEFAULT_MAX_REQUESTS_PER_MINUTE, adaptive=True):
+    global rate_limiter
+    rate_limiter = RateLimiter(requests_per_minute, max_rpm=max_rpm, adaptive=adaptive)
+
+async def navigate(page, url, timeout=90000):
+    """page.goto paced by the global rate limiter, which learns from the response."""
+    with run_metrics.measure("rate_limit_wait"):
+        await rate_limiter.acquire()
+    with run_metrics.measure("goto"):
+        response = await page.goto(url, timeout=timeout)
+    status = session_status_for(page.url)
+    if response is not None and response.status == 429:
+        rate_limiter.record_throttle("http_429")
+    elif status != SESSION_OK:
+        rate_limiter.record_throttle(status)
+    else:
+        rate_limiter.record_success()
+    return response
+
+# -----------------------
+# Resource blocking
+# -----------------------
+class ResourcePolicy:
+    """Abort requests by resource type and URL pattern via context.route.
+
+    Note that Playwright disables the HTTP cache for a context once routing is
+    enabled, so compare the counters against a run with blocking turned off.
+    """
+
+    def __init__(self, blocked_types=DEFAULT_BLOCKED_RESOURCE_TYPES,
+                 blocked_patterns=DEFAULT_BLOCKED_URL_PATTERNS):
+        self.blocked_types = set(blocked_types)
+        self.blocked_patterns = [re.compile(p) for p in blocked_patterns]
+        self.blocked_requests = 0
+        self.blocked_bytes_estimate = 0
+        self.blocked_by_type = {}
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+
+    def should_block(self, resource_type, url):
+        if resource_type in self.blocked_types:
+            return True
+        return any(p.search(url) for p in self.blocked_patterns)
+
+    async def handle_route(self, route):
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked_requests += 1
+            self.blocked_by_type[request.resource_type] = self.blocked_by_type.get(request.resource_type, 0) + 1
+            self.blocked_bytes_estimate += ESTIMATED_RESOURCE_BYTES.get(request.resource_type, ESTIMATED_OTHER_BYTES)
+            await route.abort("blockedbyclient")
+        else:
+            self.allowed_requests += 1
+            await route.continue_()
+
+    def _on_response(self, response):
+        try:
+            self.allowed_bytes += int(response.headers.get("content-length") or 0)
+        except ValueError:
+            pass
+
+    async def install(self, context):
+        await context.route("**/*", self.handle_route)
+        context.on("response", self._on_response)
+
+    def report(self, profiles=0):
+        print("\n🚫 Resource blocking:")
+        by_type = ", ".join(f"{t}={n}" for t, n in sorted(self.blocked_by_type.items())) or "none"
+        print(f"   blocked {self.blocked_requests} requests ({by_type}), "
+              f"~{self.blocked_bytes_estimate / 1_000_000:.1f} MB saved (estimated)")
+        print(f"   allowed {self.allowed_requests} requests, {self.allowed_bytes / 1_000_000:.1f} MB downloaded")
+        if profiles:
+            print(f"   per profile: {self.blocked_requests / profiles:.0f} blocked, "
+                  f"~{self.blocked_bytes_estimate / profiles / 1000:.0f} KB saved, "
+                  f"{self.allowed_bytes / profiles / 1000:.0f} KB downloaded")
+
 # -----------------------
 # Browser setup
 # -----------------------
-async def setup_browser(playwright):
-    browser = await playwright.chromium.launch(
-        headless=False,
-        args=[
-            "--no-sandbox",
-            "--disable-setuid-sandbox",
-            "--window-size=1920,1080",
-            "--disable-dev-shm-usage"
-        ]
-    )
-    context = await browser.new_context(
-        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36",
-        viewport={"width": 1366, "height": 768}
-    )
-    page = await context.new_page()
+class SessionError(Exception):
+    """LinkedIn session is not usable and no one is there to log in."""
+
+    def __init__(self, status):
+        super().__init__(f"LinkedIn session status: {status}")
+        self.status = status
+
+def session_status_for(url):
+    # Only the path: profile slugs and search keywords can contain these words too.
+    path = urlparse(url).path
+    if path.startswith(("/checkpoint", "/challenge")):
+        return SESSION_CHALLENGE
+    if path.startswith(("/login", "/authwall", "/uas/")):
+        return SESSION_LOGIN_REQUIRED
+    return SESSION_OK
+
+def ensure_session(page):
+    """Raise SessionError if `page` ended up on a login wall or challenge instead of its target."""
+    status = session_status_for(page.url)
+    if status != SESSION_OK:
+        raise SessionError(status)
+
+BROWSER_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--window-size=1920,1080",
+    "--disable-dev-shm-usage"
+]
+CONTEXT_OPTIONS = {
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36",
+    "viewport": {"width": 1366, "height": 768}
+}
+
+async def setup_browser(playwright, resource_policy=None, headless=False, user_data_dir=None, interactive=True):
+    """Launch Chromium, load the LinkedIn session and open the feed.
+
+    With `user_data_dir` a persistent context is used, so cookies and local
+    storage survive between runs (`browser` is then None); its HTTP cache
+    only helps without a ResourcePolicy, whose routing disables it. With
+    `interactive=False` a login wall or challenge raises SessionError instead
+    of waiting for someone to log in by hand.
+    """
+    if user_data_dir:
+        browser = None
+        context = await playwright.chromium.launch_persistent_context(
+            str(user_data_dir), headless=headless, args=BROWSER_ARGS, **CONTEXT_OPTIONS
+        )
+    else:
+        browser = await playwright.chromium.launch(headless=headless, args=BROWSER_ARGS)
+        context = await browser.new_context(**CONTEXT_OPTIONS)
+    try:
+        page = await open_session(context, resource_policy, interactive)
+    except SessionError:
+        await close_browser(browser, context)
+        raise
+    return browser, context, page
+
+async def open_session(context, resource_policy=None, interactive=True):
+    """Prepare a fresh context: page scripts, resource policy, cookies and feed.
+
+    Returns the page left on the feed. Raises SessionError when the session is
+    not usable and `interactive` is False.
+    """
+    await install_page_scripts(context)
+    if resource_policy:
+        await resource_policy.install(context)
+    page = context.pages[0] if context.pages else await context.new_page()
 
     if cookies_path.exists():
         try:
@@ -159,19 +1503,114 @@ async def setup_browser(playwright):
     except Exception:
         print("❌ Failed to load LinkedIn feed.")
 
-    if "/login" in page.url or "challenge" in page.url:
+    status = session_status_for(page.url)
+    if status != SESSION_OK:
+        if not interactive:
+            raise SessionError(status)
         print("👉 Please log in manually in the opened browser window...")
         ask_question("🔑 Press Enter after login...")
         cookies = await context.cookies()
         cookies_path.write_text(json.dumps(cookies, indent=2), encoding="utf-8")
         print("💾 Login session saved!")
 
-    return browser, context, page
+    return page
+
+async def close_browser(browser, context):
+    # A persistent context owns its browser process.
+    await (browser or context).close()
+
+# -----------------------
+# Warm browser pool
+# -----------------------
+class BrowserPool:
+    """Long-lived Chromium with pre-warmed, logged-in contexts leased to jobs.
+
+    Must be started, used and closed on the same event loop. Contexts share
+    the browser process but not pages; a job gets the context's feed page for
+    URL collection and opens worker pages of its own.
+    """
+
+    def __init__(self, size=2, headless=True, resource_policy=None):
+        self.size = size
+        self.headless = headless
+        self.resource_policy = resource_policy
+        self._playwright = None
+        self._browser = None
+        self._idle = asyncio.Queue()
+
+    async def start(self):
+        """Launch and warm the pool; on failure everything is closed so start() can be retried."""
+        try:
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless, args=BROWSER_ARGS)
+            for _ in range(self.size):
+                self._idle.put_nowait(await self._warm_context())
+        except BaseException:
+            await self.close()
+            raise
+        print(f"🔥 Browser pool ready with {self.size} logged-in contexts.")
+
+    async def _warm_context(self):
+        context = await self._browser.new_context(**CONTEXT_OPTIONS)
+        try:
+            page = await open_session(context, self.resource_policy, interactive=False)
+        except Exception:
+            await context.close()
+            raise
+        return context, page
+
+    async def lease(self):
+        """Wait for an idle (context, page) pair; hand it back with release()."""
+        slot = await self._idle.get()
+        if slot is None:
+            # Its context could not be re-warmed on release; try again now.
+            try:
+                slot = await self._warm_context()
+            except BaseException:
+                self._idle.put_nowait(None)
+                raise
+        return slot
+
+    async def release(self, context, page):
+        """Return a leased pair; a failed recycle never hides the job's own outcome."""
+        try:
+            # Drop pages the job opened and recycle a context whose feed page died.
+            for extra in context.pages:
+                if extra is not page:
+                    await extra.close()
+            if page.is_closed():
+                await context.close()
+                context, page = await self._warm_context()
+        except BaseException as e:
+            # Keep the slot so lease() does not wait forever on a shrinking pool.
+            self._idle.put_nowait(None)
+            if not isinstance(e, Exception):
+                raise
+            print(f"⚠️ Could not recycle a pooled context, it will be re-warmed on next lease: {e}")
+            try:
+                await context.close()
+            except Exception:
+                pass
+            return
+        self._idle.put_nowait((context, page))
+
+    async def close(self):
+        while not self._idle.empty():
+            slot = self._idle.get_nowait()
+            if slot is not None:
+                await slot[0].close()
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
 
 # -----------------------
 # Scrape Education
 # -----------------------
-async def scrape_education(page, profile_url):
+async def scrape_education(page, profile_url, loaded=False):
+    """DOM education from /details/education/; `loaded=True` means the page is already open."""
     try:
         base_url = clean_profile_url(profile_url)
         if "/in/" not in base_url:
@@ -180,49 +1619,13 @@ async def scrape_education(page, profile_url):
         education_url = f"https://www.linkedin.com/in/{username}/details/education/"
 
         print(f"🎓 Scraping education from: {education_url}")
-        await page.goto(education_url, timeout=90000)
-        await page.wait_for_timeout(4000)
-        await auto_scroll(page, step=700, max_rounds=15, wait_ms=1200)
-        await page.wait_for_timeout(2500)
+        if not loaded:
+            await navigate(page, education_url)
+        await wait_until_ready(page, "education_load", 4000, selector=LIST_ITEM_SELECTOR)
+        await auto_scroll(page, step=700, max_rounds=15, wait_ms=1200, selector=LIST_ITEM_SELECTOR)
+        await wait_until_ready(page, "education_settle", 2500, selector=LIST_ITEM_SELECTOR)
 
-        education = await page.evaluate(r"""() => {
-            let collegeName = "";
-            
-            const eduItems = document.querySelectorAll('li.pvs-list__paged-list-item');
-            
-            for (const item of eduItems) {
-                try {
-                    const schoolNameEl = item.querySelector('.hoverable-link-text.t-bold span[aria-hidden="true"]');
-                    if (schoolNameEl) {
-                        const schoolText = schoolNameEl.innerText.trim();
-                        
-                        if (schoolText && 
-                            schoolText.length > 5 && 
-                            (schoolText.toLowerCase().includes('university') || 
-                             schoolText.toLowerCase().includes('college') || 
-                             schoolText.toLowerCase().includes('institute') ||
-                             schoolText.includes('IIT') ||
-                             schoolText.includes('NIT') ||
-                             schoolText.includes('IIIT') ||
-                             schoolText.includes('BITS') ||
-                             schoolText.toLowerCase().includes('school')) &&
-                            !schoolText.toLowerCase().includes('company') &&
-                            !schoolText.toLowerCase().includes('pvt') &&
-                            !schoolText.toLowerCase().includes('ltd') &&
-                            !schoolText.toLowerCase().includes('technologies') &&
-                            !schoolText.toLowerCase().includes('solutions')) {
-                            
-                            collegeName = schoolText;
-                            break;
-                        }
-                    }
-                } catch (e) {
-                    continue;
-                }
-            }
-            
-            return collegeName || "";
-        }""")
+        education = await run_extractor(page, "education")
 
         return education
 
@@ -233,7 +1636,8 @@ async def scrape_education(page, profile_url):
 # -----------------------
 # Scrape Skills
 # -----------------------
-async def scrape_skills(page, profile_url):
+async def scrape_skills(page, profile_url, loaded=False):
+    """DOM skills from /details/skills/; `loaded=True` means the page is already open."""
     try:
         base_url = clean_profile_url(profile_url)
         if "/in/" not in base_url:
@@ -242,52 +1646,13 @@ async def scrape_skills(page, profile_url):
         skills_url = f"https://www.linkedin.com/in/{username}/details/skills/"
 
         print(f"🔍 Scraping skills from: {skills_url}")
-        await page.goto(skills_url, timeout=90000)
-        await page.wait_for_timeout(4000)
-        await auto_scroll(page, step=700, max_rounds=20, wait_ms=1200)
-        await page.wait_for_timeout(3000)
-
-        skills = await page.evaluate(r"""() => {
-            const skillsList = [];
-            const seenSkills = new Set();
-            
-            const skillItems = document.querySelectorAll('li.pvs-list__paged-list-item');
-            
-            skillItems.forEach((item) => {
-                try {
-                    const skillNameEl = item.querySelector('.hoverable-link-text.t-bold span[aria-hidden="true"]');
-                    if (skillNameEl) {
-                        const skillText = skillNameEl.innerText.trim();
-                        
-                        if (skillText && 
-                            skillText.length > 1 && 
-                            skillText.length < 50 &&
-                            !skillText.match(/^\d+/) &&
-                            !skillText.includes('experience') &&
-                            !skillText.includes('company') &&
-                            !skillText.includes('at ') &&
-                            !skillText.includes(' at ') &&
-                            !skillText.includes('|') &&
-                            !skillText.includes('endorsement') &&
-                            !skillText.includes('connection') &&
-                            !skillText.toLowerCase().includes('passed') &&
-                            !skillText.toLowerCase().includes('linkedin') &&
-                            !skillText.toLowerCase().includes('skill assessment') &&
-                            skillText !== '·') {
-                            
-                            if (!seenSkills.has(skillText.toLowerCase())) {
-                                skillsList.push(skillText);
-                                seenSkills.add(skillText.toLowerCase());
-                            }
-                        }
-                    }
-                } catch (e) {
-                    // Continue if there's an error with this item
-                }
-            });
+        if not loaded:
+            await navigate(page, skills_url)
+        await wait_until_ready(page, "skills_load", 4000, selector=LIST_ITEM_SELECTOR)
+        await auto_scroll(page, step=700, max_rounds=20, wait_ms=1200, selector=LIST_ITEM_SELECTOR)
+        await wait_until_ready(page, "skills_settle", 3000, selector=LIST_ITEM_SELECTOR)
 
-            return skillsList;
-        }""")
+        skills = await run_extractor(page, "skills")
 
         return skills
 
@@ -298,7 +1663,8 @@ async def scrape_skills(page, profile_url):
 # -----------------------
 # Scrape Experience
 # -----------------------
-async def scrape_experience(page, profile_url):
+async def scrape_experience(page, profile_url, loaded=False):
+    """DOM experience from /details/experience/; `loaded=True` means the page is already open."""
     try:
         base_url = clean_profile_url(profile_url)
         if "/in/" not in base_url:
@@ -312,176 +1678,13 @@ async def scrape_experience(page, profile_url):
         experience_url = f"https://www.linkedin.com/in/{username}/details/experience/"
 
         print(f"🔍 Scraping experience from: {experience_url}")
-        await page.goto(experience_url, timeout=90000)
-        await page.wait_for_timeout(4000)
-        await auto_scroll(page, step=700, max_rounds=20, wait_ms=1200)
-        await page.wait_for_timeout(3000)
-
-        experience_data = await page.evaluate(r"""() => {
-            const experiences = [];
-            let currentCompany = "N/A";
-            let currentTitle = "N/A";
-            let totalExperience = "N/A";
-
-            const experienceItems = document.querySelectorAll('li.pvs-list__paged-list-item');
-            
-            experienceItems.forEach((item) => {
-                try {
-                    let title = "N/A";
-                    let company = "N/A";
-                    let duration = "N/A";
-                    let employmentType = "";
-                    
-                    const titleSelectors = [
-                        'div.display-flex.align-items-center span[aria-hidden="true"]',
-                        'div.hoverable-link-text.t-bold span[aria-hidden="true"]',
-                        '.pvs-entity__summary-info .hoverable-link-text span[aria-hidden="true"]',
-                        'a[data-field*="experience"] span[aria-hidden="true"]',
-                        '.t-bold span[aria-hidden="true"]'
-                    ];
-                    
-                    for (const selector of titleSelectors) {
-                        const titleEl = item.querySelector(selector);
-                        if (titleEl && titleEl.textContent && titleEl.textContent.trim()) {
-                            const titleText = titleEl.textContent.trim();
-                            if (!titleText.match(/\d+\s*(yr|mo|year|month)/i) && 
-                                titleText.length < 100 && 
-                                !titleText.includes('·')) {
-                                title = titleText;
-                                break;
-                            }
-                        }
-                    }
-                    
-                    const companySelectors = [
-                        '.pvs-entity__sub-components .hoverable-link-text span[aria-hidden="true"]',
-                        '.t-14.t-normal span[aria-hidden="true"]',
-                        '.pvs-entity__summary-info .t-14 span[aria-hidden="true"]'
-                    ];
-                    
-                    for (const selector of companySelectors) {
-                        const companyEl = item.querySelector(selector);
-                        if (companyEl && companyEl.textContent && companyEl.textContent.trim()) {
-                            const companyText = companyEl.textContent.trim();
-                            if (!companyText.match(/Full-time|Part-time|Contract|Internship|Freelance|Self-employed|Temporary|\d+\s*(yr|mo)/i) &&
-                                !companyText.includes('·') &&
-                                companyText.length > 2) {
-                                company = companyText;
-                                break;
-                            }
-                        }
-                    }
-                    
-                    const durationSelectors = [
-                        '.pvs-entity__caption-wrapper',
-                        '.t-12.t-normal span[aria-hidden="true"]',
-                        '.pvs-entity__sub-components .t-12 span[aria-hidden="true"]'
-                    ];
-                    
-                    for (const selector of durationSelectors) {
-                        const durationEl = item.querySelector(selector);
-                        if (durationEl && durationEl.textContent && durationEl.textContent.trim()) {
-                            const durationText = durationEl.textContent.trim();
-                            if (durationText.match(/\d+\s*(yr|mo|year|month)|Present|Current/i)) {
-                                duration = durationText;
-                                break;
-                            }
-                        }
-                    }
-                    
-                    const subComponents = item.querySelector('.pvs-entity__sub-components');
-                    if (subComponents) {
-                        const companyNameEl = item.querySelector('.hoverable-link-text.t-bold span[aria-hidden="true"]');
-                        const companyName = companyNameEl ? companyNameEl.textContent.trim() : "N/A";
-                        
-                        const positions = subComponents.querySelectorAll('li.pvs-list__paged-list-item');
-                        positions.forEach(position => {
-                            try {
-                                const posTitle = position.querySelector('.hoverable-link-text.t-bold span[aria-hidden="true"]');
-                                const posDuration = position.querySelector('.pvs-entity__caption-wrapper');
-                                const posType = position.querySelector('.t-14.t-normal span[aria-hidden="true"]');
-                                
-                                experiences.push({
-                                    company: companyName,
-                                    title: posTitle ? posTitle.textContent.trim() : "N/A",
-                                    duration: posDuration ? posDuration.textContent.trim() : "N/A",
-                                    employmentType: posType ? posType.textContent.trim() : ""
-                                });
-                            } catch (e) {
-                                console.log('Error parsing position:', e);
-                            }
-                        });
-                    } else {
-                        if (title !== "N/A" || company !== "N/A") {
-                            experiences.push({
-                                company: company,
-                                title: title,
-                                duration: duration,
-                                employmentType: employmentType
-                            });
-                        }
-                    }
-                    
-                } catch (e) {
-                    console.log('Error parsing experience item:', e);
-                }
-            });
-
-            const uniqueExperiences = [];
-            const seen = new Set();
-            
-            experiences.forEach(exp => {
-                const key = `${exp.company}-${exp.title}-${exp.duration}`;
-                if (!seen.has(key) && exp.title !== "N/A" && exp.company !== "N/A") {
-                    seen.add(key);
-                    uniqueExperiences.push(exp);
-                }
-            });
-
-            for (const exp of uniqueExperiences) {
-                if (exp.duration && /Present|Current/i.test(exp.duration)) {
-                    currentCompany = exp.company;
-                    currentTitle = exp.title;
-                    break;
-                }
-            }
-            
-            if (currentCompany === "N/A" && uniqueExperiences.length > 0) {
-                currentCompany = uniqueExperiences[0].company;
-                currentTitle = uniqueExperiences[0].title;
-            }
+        if not loaded:
+            await navigate(page, experience_url)
+        await wait_until_ready(page, "experience_load", 4000, selector=LIST_ITEM_SELECTOR)
+        await auto_scroll(page, step=700, max_rounds=20, wait_ms=1200, selector=LIST_ITEM_SELECTOR)
+        await wait_until_ready(page, "experience_settle", 3000, selector=LIST_ITEM_SELECTOR)
 
-            let totalYears = 0;
-            let totalMonths = 0;
-            
-            uniqueExperiences.forEach(exp => {
-                if (exp.duration) {
-                    const yearMatch = exp.duration.match(/(\d+)\s*(yr|year)s?/i);
-                    const monthMatch = exp.duration.match(/(\d+)\s*(mo|month)s?/i);
-                    
-                    if (yearMatch) {
-                        totalYears += parseInt(yearMatch[1]);
-                    }
-                    if (monthMatch) {
-                        totalMonths += parseInt(monthMatch[1]);
-                    }
-                }
-            });
-            
-            totalYears += Math.floor(totalMonths / 12);
-            totalMonths = totalMonths % 12;
-            
-            if (totalYears > 0 || totalMonths > 0) {
-                totalExperience = `${totalYears} yrs ${totalMonths} mos`;
-            }
-
-            return {
-                experiences: uniqueExperiences,
-                currentCompany: currentCompany,
-                currentTitle: currentTitle,
-                totalExperience: totalExperience
-            };
-        }""")
+        experience_data = await run_extractor(page, "experience")
 
         return experience_data
 
@@ -495,51 +1698,367 @@ async def scrape_experience(page, profile_url):
         }
 
 # -----------------------
-# Scrape Profile
+# Voyager JSON interception
 # -----------------------
-async def scrape_profile(page, profile_url):
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+class VoyagerCapture:
+    """Collects entities from LinkedIn's voyager API responses seen by a page.
+
+    The profile pages fetch normalized JSON (`included` entities with a
+    `$type`) before rendering, so the data can be read without scrolling.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.entities = {}
+        self._pending = set()
+        page.on("response", self._on_response)
+
+    def _on_response(self, response):
+        if "/voyager/api/" not in response.url:
+            return
+        task = asyncio.ensure_future(self._read(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _read(self, response):
+        try:
+            if "json" not in (response.headers.get("content-type") or ""):
+                return
+            body = await response.json()
+        except Exception:
+            return
+        items = body.get("included") or [] if isinstance(body, dict) else []
+        for item in items:
+            if isinstance(item, dict) and item.get("$type"):
+                key = item.get("entityUrn") or f"{item['$type']}#{len(self.entities)}"
+                self.entities[key] = item
+
+    def find(self, kind, owner_id=None):
+        """Entities whose `$type` ends with `.{kind}`, optionally owned by `owner_id`."""
+        suffix = f".{kind}"
+        return [
+            e for e in self.entities.values()
+            if e["$type"].endswith(suffix) and (not owner_id or owner_id in (e.get("entityUrn") or ""))
+        ]
+
+    def resolve(self, urn):
+        return self.entities.get(urn) or {}
+
+    async def wait_for(self, kind, owner_id=None, timeout_ms=8000):
+        deadline = time.monotonic() + timeout_ms / 1000
+        while time.monotonic() < deadline:
+            if self.find(kind, owner_id):
+                return True
+            await asyncio.sleep(0.1)
+        return bool(self.find(kind, owner_id))
+
+    def detach(self):
+        self.page.remove_listener("response", self._on_response)
+        for task in list(self._pending):
+            task.cancel()
+
+def profile_username(profile_url):
+    base_url = clean_profile_url(profile_url)
+    if "/in/" not in base_url:
+        return None
+    return base_url.split("/in/")[1].split("/")[0]
+
+def format_date_range(date_range):
+    """Render a voyager dateRange/timePeriod like LinkedIn does: 'Jan 2020 - Present · 3 yrs 2 mos'."""
+    date_range = date_range or {}
+    start = date_range.get("start") or date_range.get("startDate") or {}
+    end = date_range.get("end") or date_range.get("endDate") or {}
+    if not start.get("year"):
+        return "N/A"
+
+    def label(d):
+        month = d.get("month")
+        return f"{MONTH_NAMES[month - 1]} {d['year']}" if month else str(d["year"])
+
+    now = time.localtime()
+    end_year = end.get("year") or now.tm_year
+    end_month = end.get("month") or (now.tm_mon if not end.get("year") else 12)
+    months = (end_year - start["year"]) * 12 + end_month - (start.get("month") or 1) + 1
+    years, months = divmod(max(months, 1), 12)
+    parts = []
+    if years:
+        parts.append(f"{years} yr{'s' if years > 1 else ''}")
+    if months:
+        parts.append(f"{months} mo{'s' if months > 1 else ''}")
+    end_label = label(end) if end.get("year") else "Present"
+    return f"{label(start)} - {end_label} · {' '.join(parts)}"
+
+def summarize_experiences(experiences):
+    """Python twin of the summary computed at the end of the experience extractor."""
+    unique = []
+    seen = set()
+    for exp in experiences:
+        key = f"{exp['company']}-{exp['title']}-{exp['duration']}"
+        if key not in seen and exp["title"] != "N/A" and exp["company"] != "N/A":
+            seen.add(key)
+            unique.append(exp)
+
+    current = next((e for e in unique if re.search(r"Present|Current", e["duration"] or "", re.I)), None)
+    if current is None and unique:
+        current = unique[0]
+
+    total_years = total_months = 0
+    for exp in unique:
+        year_match = re.search(r"(\d+)\s*(yr|year)s?", exp["duration"] or "", re.I)
+        month_match = re.search(r"(\d+)\s*(mo|month)s?", exp["duration"] or "", re.I)
+        if year_match:
+            total_years += int(year_match.group(1))
+        if month_match:
+            total_months += int(month_match.group(1))
+    total_years += total_months // 12
+    total_months %= 12
+
+    return {
+        "experiences": unique,
+        "currentCompany": current["company"] if current else "N/A",
+        "currentTitle": current["title"] if current else "N/A",
+        "totalExperience": f"{total_years} yrs {total_months} mos" if total_years or total_months else "N/A"
+    }
+
+def parse_profile_entity(capture, username):
+    """Return (basic_data, profile_id) for `username`, or (None, None)."""
+    for profile in capture.find("Profile"):
+        if profile.get("publicIdentifier") != username:
+            continue
+        name = " ".join(filter(None, [profile.get("firstName"), profile.get("lastName")])).strip()
+        geo = capture.resolve((profile.get("geoLocation") or {}).get("*geo"))
+        location = (profile.get("locationName") or profile.get("geoLocationName")
+                    or geo.get("defaultLocalizedName") or "N/A")
+        basic_data = {
+            "name": name or "N/A",
+            "title": profile.get("headline") or "N/A",
+            "location": location
+        }
+        return basic_data, (profile.get("entityUrn") or "").split(":")[-1] or None
+    return None, None
+
+def parse_positions(capture, owner_id=None):
+    experiences = []
+    for position in capture.find("Position", owner_id):
+        employment_type = position.get("employmentType") or capture.resolve(position.get("*employmentType"))
+        experiences.append({
+            "company": position.get("companyName") or "N/A",
+            "title": position.get("title") or "N/A",
+            "duration": format_date_range(position.get("dateRange") or position.get("timePeriod")),
+            "employmentType": (employment_type or {}).get("name") or ""
+        })
+    return experiences
+
+# Same school test as EXTRACT_EDUCATION_JS so both extraction modes pick the same entry.
+SCHOOL_WORDS = ("university", "college", "institute", "school")
+SCHOOL_ACRONYMS = ("IIT", "NIT", "IIIT", "BITS")
+NON_SCHOOL_WORDS = ("company", "pvt", "ltd", "technologies", "solutions")
+
+def is_school_name(text):
+    text = (text or "").strip()
+    lower = text.lower()
+    return (len(text) > 5
+            and (any(word in lower for word in SCHOOL_WORDS) or any(a in text for a in SCHOOL_ACRONYMS))
+            and not any(word in lower for word in NON_SCHOOL_WORDS))
+
+def parse_educations(capture, owner_id=None):
+    return [e.get("schoolName") or capture.resolve(e.get("*school")).get("name") or ""
+            for e in capture.find("Education", owner_id)]
+
+def parse_skills(capture, owner_id=None):
+    skills = []
+    seen = set()
+    for skill in capture.find("Skill", owner_id):
+        name = (skill.get("name") or "").strip()
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            skills.append(name)
+    return skills
+
+async def capture_details(page, profile_url, section, kind, owner_id=None):
+    """Load a /details/<section>/ page; return (captured voyager entities or None, page loaded)."""
+    username = profile_username(profile_url)
+    if not username:
+        return None, False
+    capture = VoyagerCapture(page)
+    loaded = False
     try:
-        url = clean_profile_url(profile_url)
-        await page.goto(url, timeout=90000)
-        await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_selector("h1", timeout=15000)
-        await page.evaluate(SCROLL_TO_BOTTOM_JS)
-        await page.wait_for_timeout(4000)
-
-        basic_data = await page.evaluate(r"""() => {
-            const getText = (selectors) => {
-                for (const sel of selectors) {
-                    const el = document.querySelector(sel);
-                    if (el && el.innerText && el.innerText.trim()) return el.innerText.trim();
-                }
-                return "N/A";
-            };
-
-            const name = getText([
-                "h1.inline.t-24.v-align-middle.break-words",
-                "h1.text-heading-xlarge",
-                "h1"
-            ]);
-            const title = getText([
-                "div.text-body-medium.break-words",
-                "div.text-body-medium",
-                ".mt1.t-18.t-black.t-normal.break-words"
-            ]);
-            const location = getText([
-                "span.text-body-small.inline.t-black--light.break-words",
-                "span.text-body-small"
-            ]);
+        print(f"🛰️ Capturing {section} JSON for: {username}")
+        await navigate(page, f"https://www.linkedin.com/in/{username}/details/{section}/")
+        loaded = True
+        found = await capture.wait_for(kind, owner_id)
+        return (capture if found else None), loaded
+    except Exception as e:
+        print(f"❌ Failed to capture {section} JSON for {profile_url}: {e}")
+        return None, loaded
+    finally:
+        capture.detach()
+
+# The DOM fallbacks below read the details page capture_details already loaded.
+async def education_section(page, profile_url, extraction="dom", owner_id=None):
+    loaded = False
+    if extraction == "network":
+        capture, loaded = await capture_details(page, profile_url, "education", "Education", owner_id)
+        schools = [s for s in parse_educations(capture, owner_id) if is_school_name(s)] if capture else []
+        if schools:
+            return schools[0]
+        run_metrics.count("network_fallbacks")
+    return await scrape_education(page, profile_url, loaded=loaded)
+
+async def experience_section(page, profile_url, extraction="dom", owner_id=None):
+    loaded = False
+    if extraction == "network":
+        capture, loaded = await capture_details(page, profile_url, "experience", "Position", owner_id)
+        if capture:
+            return summarize_experiences(parse_positions(capture, owner_id))
+        run_metrics.count("network_fallbacks")
+    return await scrape_experience(page, profile_url, loaded=loaded)
+
+async def skills_section(page, profile_url, extraction="dom", owner_id=None):
+    loaded = False
+    if extraction == "network":
+        capture, loaded = await capture_details(page, profile_url, "skills", "Skill", owner_id)
+        if capture:
+            return parse_skills(capture, owner_id)
+        run_metrics.count("network_fallbacks")
+    return await scrape_skills(page, profile_url, loaded=loaded)
 
-            return {
-                name,
-                title,
-                location
-            };
-        }""")
+# -----------------------
+# Main-profile-first sections
+# -----------------------
+# Only the first school is kept, so a truncated Education list still has it.
+FIRST_ITEM_SECTIONS = ("education",)
+
+def section_is_empty(value):
+    if isinstance(value, dict):
+        return not value.get("experiences")
+    return not value
+
+async def scrape_main_sections(page, sections=None):
+    """Read Experience, Education and Skills (or just `sections`) off the loaded main profile page.
+
+    Returns {section: data} for the sections the main page covers completely;
+    the caller visits /details/<section>/ for the rest (truncated by a
+    "Show all" link, not rendered, or parsed empty).
+    """
+    found = {}
+    try:
+        layout = await call_page_function(page, "mainSections") or {}
+        for section, shown in layout.items():
+            if sections is not None and section not in sections:
+                continue
+            if not shown or not shown["items"]:
+                continue
+            if shown["truncated"] and section not in FIRST_ITEM_SECTIONS:
+                continue
+            value = await run_extractor(page, section, {"section": section})
+            if not section_is_empty(value):
+                found[section] = value
+    except Exception as e:
+        print(f"⚠️ Could not read sections from the main profile: {e}")
+    run_metrics.count("main_sections_used", len(found))
+    print(f"📄 Main profile covered: {', '.join(found) or 'nothing'}")
+    return found
 
-        education_data = await scrape_education(page, url)
-        experience_data = await scrape_experience(page, url)
-        skills_data = await scrape_skills(page, url)
+# -----------------------
+# Scrape detail pages in parallel
+# -----------------------
+DETAIL_SECTIONS = {
+    "education": education_section,
+    "experience": experience_section,
+    "skills": skills_section,
+}
+
+async def scrape_details_parallel(context, profile_url, extraction="dom", owner_id=None, known=None,
+                                  sections=None):
+    """Open education/experience/skills (or just `sections`) in sibling pages and scrape them together.
+
+    The detail pages are independent, so wall time is roughly the slowest of
+    them instead of their sum. Sections already in `known` are not opened.
+    Returns {section: data}.
+    """
+    known = dict(known or {})
+    missing = [section for section in (DETAIL_SECTIONS if sections is None else sections)
+               if section not in known]
+    pages = [await context.new_page() for _ in missing]
+    try:
+        values = await asyncio.gather(*(
+            DETAIL_SECTIONS[section](detail_page, profile_url, extraction, owner_id)
+            for section, detail_page in zip(missing, pages)
+        ))
+        for detail_page in pages:
+            ensure_session(detail_page)
+        known.update(zip(missing, values))
+        return known
+    finally:
+        for detail_page in pages:
+            await detail_page.close()
+
+# -----------------------
+# Scrape Profile
+# -----------------------
+async def scrape_basic_info(page):
+    """Name, title and location from the rendered top card."""
+    await page.evaluate(SCROLL_TO_BOTTOM_JS)
+    await wait_until_ready(page, "profile_settle", 4000)
+
+    return await run_extractor(page, "topCard")
+
+async def scrape_profile(page, profile_url, parallel_details=False, extraction="dom", timings=None,
+                         fields=None):
+    """Scrape one profile; per-stage durations go into `timings` when given.
+
+    Only the pages plan_profile_visits() needs for `fields` are loaded, and
+    the result holds just those fields (always including "url").
+    """
+    capture = None
+    try:
+        url = clean_profile_url(profile_url)
+        fields = resolve_fields(fields)
+        visits = plan_profile_visits(fields, extraction)
+        sections = [visit for visit in visits if visit != "profile"]
+        basic_data = {}
+        owner_id = None
+        known = {}
+        if "profile" in visits:
+            if extraction == "network":
+                capture = VoyagerCapture(page)
+            with timed(timings, "navigation"):
+                await navigate(page, url)
+                await page.wait_for_load_state("domcontentloaded")
+                # A login or challenge page has an h1 too; it must not become the name.
+                ensure_session(page)
+                await page.wait_for_selector("h1", timeout=15000)
+
+            with timed(timings, "top_card"):
+                if capture:
+                    if await capture.wait_for("Profile", timeout_ms=5000):
+                        basic_data, owner_id = parse_profile_entity(capture, profile_username(url))
+                    capture.detach()
+                    capture = None
+                if not basic_data:
+                    basic_data = await scrape_basic_info(page)
+
+            if extraction == "main" and sections:
+                with timed(timings, "main_sections"):
+                    known = await scrape_main_sections(page, sections)
+
+        if parallel_details:
+            with timed(timings, "details"):
+                section_data = await scrape_details_parallel(page.context, url, extraction, owner_id, known,
+                                                             sections)
+        else:
+            section_data = dict(known)
+            for section in sections:
+                if section not in section_data:
+                    with timed(timings, section):
+                        section_data[section] = await DETAIL_SECTIONS[section](page, url, extraction, owner_id)
+                    ensure_session(page)
+        education_data = section_data.get("education", "N/A")
+        experience_data = section_data.get("experience") or {}
+        skills_data = section_data.get("skills")
 
         experience_details = []
         for exp in (experience_data.get("experiences") or []):
@@ -565,234 +2084,784 @@ async def scrape_profile(page, profile_url):
             "experience_details": clean_na(experience_details_str),
             "skills": clean_na(skills_str)
         }
-        
-        print(f"✅ Scraped {url}: {result['name']} - {result['title']}")
-            
+        result = {field: result[field] for field in fields}
+
+        print(f"✅ Scraped {url}: {result.get('name', '')} - {result.get('title', '')}")
+
         return result
 
     except Exception as e:
         print(f"❌ Failed to scrape {profile_url}: {e}")
-        return {
-            "name": "N/A", "title": "N/A", "location": "N/A",
-            "education": "N/A", "url": clean_profile_url(profile_url),
-            "total_experience": "N/A", "experience_details": "N/A",
-            "skills": "N/A"
-        }
+        return failed_result(profile_url)
+    finally:
+        if capture:
+            capture.detach()
+
+# -----------------------
+# Concurrent profile scraping pool
+# -----------------------
+async def scrape_profiles_concurrently(context, urls, role_name, concurrency=DEFAULT_CONCURRENCY,
+                                       parallel_details=False, cache=None, completed=None, on_result=None,
+                                       keep_results=True, extraction="dom", on_event=None,
+                                       delay_range=DELAY_PROFILES[DEFAULT_DELAY_PROFILE], total=None, fields=None,
+                                       card_hashes=None):
+    """Scrape `urls` with up to `concurrency` rate-limited pages of one logged-in context."""
+    if isinstance(urls, asyncio.Queue):
+        # A producer is still filling it and closes it with None; `total` is
+        # the expected count until then.
+        queue = urls
+    else:
+        queue = asyncio.Queue()
+        for url in urls:
+            queue.put_nowait(url)
+        queue.put_nowait(None)
+        total = len(urls)
+    results = {}
+    progress = {"done": 0, "taken": 0, "total": total}
+
+    def emit(event):
+        if on_event:
+            on_event(event)
+
+    def finish(index, url, result, source, timings=None, seconds=0.0):
+        # With keep_results=False results only stream through on_result.
+        if keep_results:
+            results[index] = result
+        if on_result:
+            on_result(url, result)
+        progress["done"] += 1
+        failed = is_failed_result(result)
+        run_metrics.record_profile(url, seconds, timings, failed, source)
+        emit({"type": "profile_finished", "url": url, "index": index, "done": progress["done"],
+              "total": progress["total"], "failed": failed, "source": source,
+              "timings": timings, "seconds": round(seconds, 3),
+              "requests_per_minute": round(rate_limiter.requests_per_minute or 0, 2)})
+
+    async def worker(worker_id):
+        page = await context.new_page()
+        try:
+            while True:
+                url = await queue.get()
+                if url is None:
+                    # End of input: leave the marker for the other workers.
+                    queue.put_nowait(None)
+                    progress["total"] = progress["taken"]
+                    return
+                index = progress["taken"]
+                progress["taken"] += 1
+                of_total = progress["total"] or "?"
+                prior = completed.get(clean_profile_url(url)) if completed else None
+                if prior is not None:
+                    print(f"⏭️ [{index + 1}/{of_total}] Already scraped in this job: {url}")
+                    finish(index, url, prior, "journal")
+                    continue
+
+                # card_hashes (clean URL -> search_card_hash) lets an unchanged card reuse the entry.
+                card_hash = card_hashes.get(clean_profile_url(url)) if card_hashes is not None else None
+                cached = cache.get(url, fields, card_hash) if cache else None
+                if cached is not None:
+                    reason = "Unchanged" if card_hash else "Using cached"
+                    print(f"💾 [{index + 1}/{of_total}] {reason} {role_name} profile: {url}")
+                    finish(index, url, cached, "cache")
+                    continue
+
+                print(f"\n🔍 [{index + 1}/{of_total}] (worker {worker_id}) Scraping {role_name} profile: {url}")
+                emit({"type": "profile_started", "url": url, "index": index, "worker": worker_id})
+                timings = {}
+                started = time.monotonic()
+                try:
+                    result = await scrape_profile(page, url, parallel_details=parallel_details,
+                                                  extraction=extraction, timings=timings, fields=fields)
+                    if is_failed_result(result):
+                        rate_limiter.record_empty()
+                        emit({"type": "error", "url": url, "message": "Profile could not be scraped"})
+                    elif cache:
+                        cache.put(url, result, card_hash)
+                except Exception as e:
+                    print(f"❌ Failed to scrape profile {url}: {e}")
+                    emit({"type": "error", "url": url, "message": str(e)})
+                    result = failed_result(url, name="Failed to scrape")
+                finish(index, url, result, "scraped", timings, time.monotonic() - started)
+
+                more_to_do = progress["total"] is None or progress["taken"] < progress["total"]
+                if more_to_do and delay_range[1] > 0:
+                    delay_time = random.randint(*delay_range)
+                    print(f"⏳ Worker {worker_id} waiting {delay_time/1000:.1f}s before next profile...")
+                    await delay(delay_time)
+        finally:
+            await page.close()
+
+    worker_count = max(1, min(concurrency, total or concurrency))
+    await asyncio.gather(*(worker(n) for n in range(1, worker_count + 1)))
+    return [results[index] for index in sorted(results)]
 
 # -----------------------
 # Collect Profile URLs from LinkedIn Search Results - DYNAMIC
 # -----------------------
-async def collect_search_profile_urls(page, search_url, limit, role_name):
-    profile_urls = set()
+def search_page_url(search_url, page_number):
+    """Return `search_url` with its `page=` query parameter set to `page_number`."""
+    parsed = urlparse(search_url)
+    query = parse_qs(parsed.query, keep_blank_values=True)
+    query.pop("page", None)
+    if page_number > 1:
+        query["page"] = [str(page_number)]
+    return urlunparse(parsed._replace(query=urlencode(query, doseq=True)))
+
+async def load_search_page(page, url):
+    """Open one search results page and wait for its result cards."""
+    await navigate(page, url)
+    await wait_until_ready(page, "search_load", 5000, selector=SEARCH_RESULT_SELECTOR)
+
+async def collect_search_profile_urls(page, search_url, limit, role_name, on_event=None, on_url=None,
+                                      on_card=None, cards_only=False):
+    """Collect up to `limit` profile URLs by walking the `page=` parameter until a page adds none.
+
+    Page N+1 loads in a second tab while page N is parsed. `on_url(url)` and
+    `on_card({url, name, title, location})` see each new URL as it is found.
+    """
+    profile_urls = []
+    seen = set()
     print(f"🔍 Starting to collect {limit} {role_name} profiles from search results: {search_url}")
 
-    await page.goto(search_url, timeout=90000)
-    await page.wait_for_load_state("domcontentloaded")
-    await page.wait_for_timeout(5000)
-
-    max_attempts = 50
-    attempt = 0
-    no_new_profiles_count = 0
-    
-    while attempt < max_attempts and len(profile_urls) < limit:
-        attempt += 1
-        previous_count = len(profile_urls)
-        
-        print(f"🔄 Collection attempt {attempt}/{max_attempts} - {role_name} profiles found: {len(profile_urls)}")
-        
-        await auto_scroll(page, step=1200, max_rounds=20, wait_ms=1500)
-        await page.wait_for_timeout(4000)
+    prefetch_page = await page.context.new_page()
+    tabs = (page, prefetch_page)
+    loading = None
+    expected_per_page = SEARCH_RESULTS_PER_PAGE
+    try:
+        for page_number in range(1, MAX_SEARCH_PAGES + 1):
+            current = tabs[(page_number - 1) % 2]
+            if loading is None:
+                loading = asyncio.create_task(load_search_page(current, search_page_url(search_url, page_number)))
+            try:
+                await loading
+            except Exception as e:
+                print(f"⚠️ Search page {page_number} failed to load: {e}")
+                break
+
+            loading = None
+            # Skip the prefetch when this page should already complete the limit.
+            if page_number < MAX_SEARCH_PAGES and len(profile_urls) + expected_per_page < limit:
+                loading = asyncio.create_task(
+                    load_search_page(tabs[page_number % 2], search_page_url(search_url, page_number + 1))
+                )
+
+            await auto_scroll(current, step=1200, max_rounds=4, wait_ms=600, selector=SEARCH_RESULT_SELECTOR)
+            new_profiles_found = 0
+            cards = {}
+            if on_card or cards_only:
+                cards = {card["url"]: card for card in
+                         await run_extractor(current, "searchCards", {"selector": SEARCH_RESULT_SELECTOR})}
+            # Cards-only rows come from result cards alone, not every /in/ link on the page.
+            links = list(cards) if cards_only else await run_extractor(current, "searchLinks")
+            for url in links:
+                if url and url not in seen and len(profile_urls) < limit:
+                    seen.add(url)
+                    profile_urls.append(url)
+                    new_profiles_found += 1
+                    if on_card:
+                        on_card(cards.get(url) or {"url": url})
+                    if on_url:
+                        on_url(url)
+                    if on_event:
+                        on_event({"type": "url_collected", "url": url, "count": len(profile_urls)})
+
+            expected_per_page = new_profiles_found
+            print(f"📊 Page {page_number}: {new_profiles_found} new {role_name} profiles. "
+                  f"Total profiles: {len(profile_urls)}")
+            if new_profiles_found == 0:
+                if page_number == 1:
+                    # An empty first page is more often throttling than a real empty search.
+                    rate_limiter.record_empty()
+                print("🛑 No new profiles on this page - end of results")
+                break
+            if len(profile_urls) >= limit:
+                print(f"✅ Collected enough {role_name} profiles: {len(profile_urls)}")
+                break
+    finally:
+        if loading and not loading.done():
+            loading.cancel()
+            try:
+                await loading
+            except BaseException:
+                pass
+        await prefetch_page.close()
 
-        # LinkedIn Search Results - Next Page Navigation
-        try:
-            next_button_selectors = [
-                "button[aria-label='Next']",
-                "button[aria-label='next']",
-                ".artdeco-pagination__button--next",
-                "button.artdeco-pagination__button--next:not([disabled])",
-                "button:has-text('Next')",
-                "li.artdeco-pagination__indicator--number + li button",
-                ".artdeco-pagination__button.artdeco-pagination__button--next:not([disabled])"
-            ]
-            
-            for selector in next_button_selectors:
-                try:
-                    next_btn = await page.query_selector(selector)
-                    if next_btn:
-                        is_disabled = await next_btn.get_attribute('disabled')
-                        is_visible = await next_btn.is_visible()
-                        if not is_disabled and is_visible:
-                            print("➡️ Found and clicking Next button...")
-                            await next_btn.click()
-                            await page.wait_for_timeout(6000)
-                            break
-                except Exception:
-                    continue
-        except Exception:
-            pass
+    print(f"🎯 Final collection: {len(profile_urls)} {role_name} profiles")
+    return profile_urls
 
-        # Collect profile URLs from LinkedIn search results
-        new_urls = await page.evaluate(r"""() => {
-            const profileUrls = [];
-            
-            // LinkedIn search results have specific structure
-            // Look for profile links in search result cards
-            const searchResults = document.querySelectorAll('.reusable-search__result-container, .entity-result, .search-result, .search-result__info, .search-entity-card');
-            
-            searchResults.forEach(result => {
-                // Look for profile links within each result
-                const profileLinks = result.querySelectorAll("a[href*='/in/']");
-                profileLinks.forEach(link => {
-                    const href = link.href || link.getAttribute("href") || "";
-                    if (href && href.includes("/in/") && 
-                        !href.includes("/miniProfile/") && 
-                        !href.includes("/company/") &&
-                        !href.includes("/school/") &&
-                        !href.includes("/feed/") &&
-                        !href.includes("/posts/") &&
-                        !href.includes("/activity/")) {
-                        
-                        const cleanUrl = href.split('?')[0];
-                        profileUrls.push(cleanUrl);
-                    }
-                });
-            });
-
-            // Additional fallback - look for any profile links on page
-            const allProfileLinks = document.querySelectorAll("a[href*='/in/']");
-            allProfileLinks.forEach(link => {
-                const href = link.href || link.getAttribute("href") || "";
-                if (href && href.includes("/in/") && 
-                    !href.includes("/miniProfile/") && 
-                    !href.includes("/company/") &&
-                    !href.includes("/school/") &&
-                    !href.includes("/feed/") &&
-                    !href.includes("/posts/") &&
-                    !href.includes("/activity/")) {
-                    
-                    const cleanUrl = href.split('?')[0];
-                    profileUrls.push(cleanUrl);
-                }
-            });
-            
-            // Remove duplicates
-            return [...new Set(profileUrls)];
-        }""")
+# -----------------------
+# Run one search job on a logged-in context
+# -----------------------
+async def run_search_job(context, page, search_url=None, limit=10, job_id=None, concurrency=DEFAULT_CONCURRENCY,
+                         parallel_details=False, cache="use", cache_ttl_hours=DEFAULT_CACHE_TTL_HOURS,
+                         output="csv", extraction="dom", delay_profile=DEFAULT_DELAY_PROFILE,
+                         pipeline=False, fields=None, cards_only=False,
+                         card_ttl_hours=DEFAULT_CARD_CACHE_TTL_HOURS, on_event=None, on_result=None):
+    """Collect and scrape one people search on `page`, with workers opening their own pages in `context`."""
+    def emit_event(event):
+        if on_event:
+            on_event({"job_id": journal.job_id, "time": time.time(), **event})
+
+    def emit(kind, **fields):
+        emit_event({"type": kind, **fields})
+
+    delay_range = check_job_options(cache, delay_profile, extraction)
+
+    fields = resolve_card_fields(fields) if cards_only else resolve_fields(fields)
+    journal = JobJournal(job_id or new_job_id())
+    if journal.search_url:
+        # Resuming: the journaled search wins over the arguments.
+        search_url, role_name, limit = journal.search_url, journal.role_name, journal.limit
+        cards_only = journal.cards_only
+        fields = resolve_card_fields(journal.fields) if cards_only else resolve_fields(journal.fields)
+        if cards_only:
+            # Cards are cheap to collect again, so nothing is checkpointed per row.
+            print(f"♻️ Resuming job {journal.job_id}: collecting {role_name} search cards again")
+        elif journal.urls is not None:
+            print(f"♻️ Resuming job {journal.job_id}: {len(journal.completed())}/{len(journal.urls)} "
+                  f"{role_name} profiles already done")
+        else:
+            # Interrupted during URL collection: reuse the recorded search.
+            print(f"♻️ Resuming job {journal.job_id}: collecting {role_name} profiles again")
+    else:
+        role_name = extract_role_from_url(search_url)
+        journal.record_job(search_url, role_name, limit, fields, cards_only)
+    print(f"🗂️ Job id: {journal.job_id} (rerun with this id to resume)")
 
-        for url in new_urls:
-            if url:
-                profile_urls.add(url)
+    if cards_only:
+        # No profile is visited: each result card becomes a "<role> leads" row
+        # that --profiles can deep-scrape later.
+        emit("phase", phase="collecting", role_name=role_name, limit=limit, cards_only=True)
+        print(f"🎯 Target URL: {search_url}")
+        own_sink = isinstance(output, str)
+        sink = open_sink(f"{role_name} leads", output, fields) if own_sink else output
+        if sink:
+            print(f"📝 Streaming search cards to {getattr(sink, 'path', sink)}")
+
+        def handle_card(card):
+            result = {field: value for field, value in card_result(card).items() if field in fields}
+            if sink:
+                sink.write(result)
+            if on_result:
+                on_result(card["url"], result)
 
-        new_profiles_found = len(profile_urls) - previous_count
-        print(f"📊 Found {new_profiles_found} new {role_name} profiles. Total profiles: {len(profile_urls)}")
+        try:
+            urls = await collect_search_profile_urls(page, search_url, limit, role_name, on_event=emit_event,
+                                                     on_card=handle_card, cards_only=True)
+        finally:
+            if own_sink:
+                sink.close()
+        journal.record_urls(urls)
+        if not urls:
+            print(f"❌ No {role_name} profile URLs found. Please check the URL or search filters.")
+            return {"status": "no_profiles", "job_id": journal.job_id, "role_name": role_name}
+        return {
+            "status": SESSION_OK,
+            "job_id": journal.job_id,
+            "role_name": role_name,
+            "profiles": len(urls),
+            "rows": len(urls),
+            "output": str(sink.path) if getattr(sink, "path", None) else None
+        }
 
-        if new_profiles_found == 0:
-            no_new_profiles_count += 1
+    if fields != tuple(OUTPUT_FIELDS):
+        print(f"🧭 Fields: {', '.join(fields)} -> pages per profile: "
+              f"{', '.join(plan_profile_visits(fields, extraction)) or 'none'}")
+
+    urls = journal.urls
+    streamed = None
+    # Only filled while collecting; a resumed URL list falls back to the cache TTL.
+    card_hashes = {} if cache == "incremental" else None
+    on_card = card_hash_recorder(card_hashes) if card_hashes is not None else None
+    if urls is None:
+        emit("phase", phase="collecting", role_name=role_name, limit=limit)
+        print(f"🎯 Target URL: {search_url}")
+        if pipeline:
+            # URLs go straight to the workers while collection continues.
+            streamed = asyncio.Queue()
         else:
-            no_new_profiles_count = 0
+            # Collect profile URLs from the search results page
+            urls = await collect_search_profile_urls(page, search_url, limit, role_name, on_event=emit_event,
+                                                     on_card=on_card)
+            journal.record_urls(urls)
+
+    if urls is not None and not urls:
+        print(f"❌ No {role_name} profile URLs found. Please check the URL or search filters.")
+        return {"status": "no_profiles", "job_id": journal.job_id, "role_name": role_name}
+
+    expected = len(urls) if urls is not None else limit
+    print(f"🎯 Starting to scrape {expected} {role_name} profiles with {concurrency} workers "
+          f"({rate_limiter_description()})...")
+    # A format name from OUTPUT_SINKS, a caller-owned sink left open, or None.
+    own_sink = isinstance(output, str)
+    sink = open_sink(role_name, output, fields) if own_sink else output
+    if sink:
+        print(f"📝 Streaming results to {getattr(sink, 'path', sink)}")
+
+    emit("phase", phase="scraping", role_name=role_name, total=expected, pipeline=streamed is not None)
+    rows = {"count": 0}
+
+    def handle_result(url, result):
+        if sink:
+            sink.write(result)
+        journal.record_result(url, result)
+        rows["count"] += 1
+        if on_result:
+            on_result(url, result)
+
+    def stream_url(url):
+        # Journaled before a worker sees it, so a resume never collects again.
+        journal.record_url(url)
+        streamed.put_nowait(url)
+
+    async def collect_while_scraping():
+        try:
+            return await collect_search_profile_urls(page, search_url, limit, role_name,
+                                                     on_event=emit_event, on_url=stream_url,
+                                                     on_card=on_card)
+        except Exception as e:
+            # Profiles already queued are still scraped and journaled; a rerun
+            # with the same job id scrapes the URLs collected so far.
+            print(f"❌ URL collection stopped early: {e}")
+            emit("error", message=f"URL collection stopped early: {e}")
+            return None
+        finally:
+            streamed.put_nowait(None)
 
-        if no_new_profiles_count >= 8:
-            print("🔄 No new profiles found in recent attempts. Trying different scroll pattern...")
-            await page.evaluate(SCROLL_TO_TOP_JS)
-            await page.wait_for_timeout(4000)
-            await page.evaluate(SCROLL_TO_BOTTOM_JS)
-            await page.wait_for_timeout(5000)
-            no_new_profiles_count = 0
+    try:
+        with open_profile_cache(cache, cache_ttl_hours, card_ttl_hours) as profile_cache:
+            scraping = scrape_profiles_concurrently(context, streamed or urls, role_name, concurrency,
+                                                    parallel_details=parallel_details, cache=profile_cache,
+                                                    completed=journal.completed(),
+                                                    on_result=handle_result, keep_results=False,
+                                                    extraction=extraction, on_event=emit_event,
+                                                    delay_range=delay_range, total=expected, fields=fields,
+                                                    card_hashes=card_hashes)
+            if streamed is None:
+                await scraping
+            else:
+                urls, _ = await asyncio.gather(collect_while_scraping(), scraping)
+    finally:
+        if own_sink:
+            sink.close()
+
+    if urls == []:
+        print(f"❌ No {role_name} profile URLs found. Please check the URL or search filters.")
+        return {"status": "no_profiles", "job_id": journal.job_id, "role_name": role_name}
+
+    return {
+        "status": SESSION_OK,
+        "job_id": journal.job_id,
+        "role_name": role_name,
+        "profiles": len(urls) if urls is not None else rows["count"],
+        "rows": rows["count"],
+        "output": str(sink.path) if getattr(sink, "path", None) else None
+    }
 
-        if len(profile_urls) >= limit:
-            print(f"✅ Collected enough {role_name} profiles: {len(profile_urls)}")
-            break
+# -----------------------
+# Batch mode: many searches, one session
+# -----------------------
+def load_manifest(path):
+    """Read a JSONL manifest: one {"search_url", "limit", "role"?} object per line."""
+    searches = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line)
+            search_url = entry.get("search_url") or entry.get("url")
+            if not search_url or "linkedin.com/search/results/people" not in search_url:
+                raise ValueError(f"{path}:{line_no}: a LinkedIn people search results URL is required")
+            searches.append({
+                "search_url": search_url,
+                "limit": int(entry.get("limit", 10)),
+                "role": entry.get("role") or extract_role_from_url(search_url)
+            })
+    return searches
+
+async def run_batch(context, page, searches, concurrency=DEFAULT_CONCURRENCY, parallel_details=False,
+                    cache="use", cache_ttl_hours=DEFAULT_CACHE_TTL_HOURS, output="csv", extraction="dom",
+                    delay_profile=DEFAULT_DELAY_PROFILE, fields=None, card_ttl_hours=DEFAULT_CARD_CACHE_TTL_HOURS,
+                    on_event=None):
+    """Collect every search first, then scrape each unique profile once.
+
+    Profiles are deduplicated across searches with clean_profile_url() and
+    each result is written to the output of every role whose search found it.
+    `fields` applies to every search.
+    """
+    delay_range = check_job_options(cache, delay_profile, extraction)
+    fields = resolve_fields(fields)
+    card_hashes = {} if cache == "incremental" else None
+
+    roles_by_url = {}
+    collected = 0
+    for number, search in enumerate(searches, 1):
+        role_name = search["role"]
+        print(f"\n📋 Search {number}/{len(searches)}: {role_name}")
+        urls = await collect_search_profile_urls(
+            page, search["search_url"], search["limit"], role_name, on_event=on_event,
+            on_card=card_hash_recorder(card_hashes) if card_hashes is not None else None)
+        collected += len(urls)
+        for url in urls:
+            roles = roles_by_url.setdefault(clean_profile_url(url), [])
+            if role_name not in roles:
+                roles.append(role_name)
+
+    unique_urls = list(roles_by_url)
+    print(f"\n🧮 {collected} profiles collected across {len(searches)} searches, {len(unique_urls)} unique")
+    if not unique_urls:
+        return {"status": "no_profiles", "searches": len(searches), "collected": collected, "unique_profiles": 0,
+                "profiles": 0, "outputs": {}}
+
+    sinks = {}
+    for search in searches:
+        if search["role"] not in sinks:
+            sinks[search["role"]] = open_sink(search["role"], output, fields)
+
+    def handle_result(url, result):
+        for role_name in roles_by_url[clean_profile_url(url)]:
+            sinks[role_name].write(result)
 
-        await delay(4000 + random.randint(3000, 6000))
+    try:
+        with open_profile_cache(cache, cache_ttl_hours, card_ttl_hours) as profile_cache:
+            await scrape_profiles_concurrently(context, unique_urls, "batch", concurrency,
+                                               parallel_details=parallel_details, cache=profile_cache,
+                                               on_result=handle_result, keep_results=False,
+                                               extraction=extraction, on_event=on_event,
+                                               delay_range=delay_range, fields=fields, card_hashes=card_hashes)
+    finally:
+        for sink in sinks.values():
+            sink.close()
+
+    return {
+        "status": SESSION_OK,
+        "searches": len(searches),
+        "collected": collected,
+        "unique_profiles": len(unique_urls),
+        "profiles": len(unique_urls),
+        "outputs": {role: {"rows": sink.rows, "output": str(sink.path)} for role, sink in sinks.items()}
+    }
 
-    final_list = list(profile_urls)[:limit]
-    print(f"🎯 Final collection: {len(final_list)} {role_name} profiles")
-    
-    return final_list
+# -----------------------
+# Deep-scrape a saved profile list
+# -----------------------
+def load_profile_urls(path):
+    """Unique profile URLs from an earlier output file (CSV or JSONL) or a plain list, one per line."""
+    path = Path(path)
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.suffix == ".csv":
+            urls = [row.get(OUTPUT_FIELDS["url"]) for row in csv.DictReader(f)]
+        elif path.suffix == ".jsonl":
+            rows = [json.loads(line) for line in f if line.strip()]
+            urls = [row.get(OUTPUT_FIELDS["url"]) or row.get("url") for row in rows]
+        else:
+            urls = [line.strip() for line in f]
+    unique = {}
+    for url in urls:
+        if url and "/in/" in url:
+            unique.setdefault(clean_profile_url(url), url)
+    return list(unique)
+
+def profile_list_role(path):
+    """Role name for a profile list, e.g. "python developer profiles" for linkedin_python_developer_leads_results.csv.
+
+    The " profiles" suffix keeps the output from overwriting the list being read.
+    """
+    stem = re.sub(r'^linkedin_|_results$', '', Path(path).stem)
+    role = re.sub(r'_leads$', '', stem).replace('_', ' ').strip()
+    return f"{role} profiles" if role else "profiles"
+
+async def run_profile_list(context, urls, role_name, concurrency=DEFAULT_CONCURRENCY, parallel_details=False,
+                           cache="use", cache_ttl_hours=DEFAULT_CACHE_TTL_HOURS, output="csv", extraction="dom",
+                           delay_profile=DEFAULT_DELAY_PROFILE, fields=None, on_event=None):
+    """Scrape a given list of profile URLs, e.g. the rows of a cards_only run, without searching."""
+    delay_range = check_job_options(cache, delay_profile, extraction)
+    fields = resolve_fields(fields)
+    if not urls:
+        return {"status": "no_profiles", "role_name": role_name}
+
+    print(f"🎯 Scraping {len(urls)} listed {role_name} profiles with {concurrency} workers "
+          f"({rate_limiter_description()})...")
+    sink = open_sink(role_name, output, fields)
+    print(f"📝 Streaming results to {sink.path}")
+    try:
+        with open_profile_cache(cache, cache_ttl_hours) as profile_cache:
+            await scrape_profiles_concurrently(context, urls, role_name, concurrency,
+                                               parallel_details=parallel_details, cache=profile_cache,
+                                               on_result=lambda url, result: sink.write(result),
+                                               keep_results=False, extraction=extraction, on_event=on_event,
+                                               delay_range=delay_range, fields=fields)
+    finally:
+        sink.close()
+
+    return {"status": SESSION_OK, "role_name": role_name, "profiles": len(urls), "rows": sink.rows,
+            "output": str(sink.path)}
 
 # -----------------------
-# Main execution function - DYNAMIC
+# Programmatic API
 # -----------------------
-async def main():
-    async with async_playwright() as p:
-        browser, context, page = await setup_browser(p)
+class ScrapeRun:
+    """Async iterator over the profile results of one search, in completion order.
+
+        run = scrape(search_url, limit=50, concurrency=4, output="jsonl")
+        async for result in run:
+            ...
+        print(run.summary)
+
+    Without `context` a headless, non-interactive browser is launched for the
+    run (a login wall raises SessionError). Pass `context` and `page` to reuse
+    an already logged-in session. Remaining keyword arguments go to
+    run_search_job.
+    """
+
+    def __init__(self, search_url=None, limit=10, context=None, page=None, headless=True, user_data_dir=None,
+                 block_resources=True, requests_per_minute=None, **job_options):
+        self.search_url = search_url
+        self.limit = limit
+        self.context = context
+        self.page = page
+        self.headless = headless
+        self.user_data_dir = user_data_dir
+        self.block_resources = block_resources
+        self.requests_per_minute = requests_per_minute
+        self.job_options = job_options
+        self.summary = None
+
+    async def _run(self, on_result):
+        if self.requests_per_minute:
+            set_rate_limit(self.requests_per_minute)
+        if self.context is not None:
+            page = self.page or await self.context.new_page()
+            try:
+                return await run_search_job(self.context, page, self.search_url, self.limit,
+                                            on_result=on_result, **self.job_options)
+            finally:
+                if self.page is None:
+                    await page.close()
+
+        resource_policy = ResourcePolicy() if self.block_resources else None
+        async with async_playwright() as p:
+            browser, context, page = await setup_browser(p, resource_policy, headless=self.headless,
+                                                         user_data_dir=self.user_data_dir, interactive=False)
+            try:
+                return await run_search_job(context, page, self.search_url, self.limit,
+                                            on_result=on_result, **self.job_options)
+            finally:
+                await close_browser(browser, context)
 
-        # Ask for LinkedIn search results URL
-        print("📝 Please provide the LinkedIn search results URL for any role/position")
-        print("Example: https://www.linkedin.com/search/results/people/?keywords=software%20engineer...")
-        print("Example: https://www.linkedin.com/search/results/people/?keywords=data%20scientist&geoUrn=%5B\"103644278\"%5D")
-        print("Example: https://www.linkedin.com/search/results/people/?keywords=product%20manager&currentCompany=%5B\"1441\"%5D")
-        
-        search_url = ask_question("🔗 Enter the LinkedIn search results URL: ").strip()
-        if not search_url:
-            print("❌ URL is required. Exiting.")
-            await browser.close()
-            return
+    async def __aiter__(self):
+        results = asyncio.Queue()
+        finished = object()
 
-        # Validate URL format
-        if "linkedin.com/search/results/people" not in search_url:
-            print("❌ Please provide a valid LinkedIn people search results URL")
-            await browser.close()
-            return
+        async def produce():
+            try:
+                self.summary = await self._run(lambda url, result: results.put_nowait(result))
+            finally:
+                results.put_nowait(finished)
 
-        # Extract role from URL
-        role_name = extract_role_from_url(search_url)
-        print(f"🎯 Detected role: {role_name}")
+        task = asyncio.ensure_future(produce())
+        try:
+            while True:
+                item = await results.get()
+                if item is finished:
+                    break
+                yield item
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
 
+def scrape(search_url=None, limit=10, **options):
+    """Entry point for code: returns a ScrapeRun to iterate with `async for`."""
+    return ScrapeRun(search_url, limit, **options)
+
+# -----------------------
+# Main execution function - DYNAMIC
+# -----------------------
+def print_run_reports(resource_policy, profiles, metrics_json=None):
+    """End-of-run readiness, stage timing and resource blocking reports."""
+    print_readiness_report()
+    run_metrics.print_report()
+    if rate_limiter.requests_per_minute:
+        print(f"🚦 Final pace: {rate_limiter_description()}, "
+              f"{rate_limiter.throttle_events} throttling signals")
+    if metrics_json:
+        run_metrics.write_json(metrics_json)
+        print(f"📈 Metrics written to {metrics_json}")
+    if resource_policy:
+        resource_policy.report(profiles=profiles)
+
+async def main(search_url=None, limit=None, concurrency=DEFAULT_CONCURRENCY,
+               requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, parallel_details=False, cache="use",
+               cache_ttl_hours=DEFAULT_CACHE_TTL_HOURS, job_id=None, output="csv", extraction="dom",
+               delay_profile=DEFAULT_DELAY_PROFILE, block_resources=True, headless=False,
+               user_data_dir=None, interactive=None, batch_manifest=None, pipeline=False,
+               metrics_json=None, max_requests_per_minute=DEFAULT_MAX_REQUESTS_PER_MINUTE, adaptive_rate=True,
+               fields=None, cards_only=False, profiles_file=None, login=False,
+               card_ttl_hours=DEFAULT_CARD_CACHE_TTL_HOURS):
+    """Command-line wrapper around scrape(): prompts for anything not given.
+
+    With `batch_manifest` every search in that JSONL file is run in this one
+    browser session through run_batch() instead, and with `profiles_file`
+    the profiles listed there go through run_profile_list(). `metrics_json`
+    is a path for the run's stage timing summary. `login=True` only opens
+    the session (prompting for a login if needed) and exits.
+    """
+    if cards_only and (batch_manifest or profiles_file):
+        # Both would visit every profile just for the card columns.
+        raise ValueError("cards_only only works with a single search URL, not a batch or profiles file")
+    fields = resolve_card_fields(fields) if cards_only else resolve_fields(fields)
+    profile_urls = load_profile_urls(profiles_file) if profiles_file else None
+    set_rate_limit(requests_per_minute, max_rpm=max_requests_per_minute, adaptive=adaptive_rate)
+    resource_policy = ResourcePolicy() if block_resources else None
+
+    if interactive is None:
+        interactive = not headless
+
+    async with async_playwright() as p:
         try:
-            limit = int(ask_question(f"🔢 How many {role_name} profiles to scrape? (default: 10): ").strip() or "10")
-        except Exception:
-            limit = 10
+            browser, context, page = await setup_browser(p, resource_policy, headless=headless,
+                                                         user_data_dir=user_data_dir, interactive=interactive)
+        except SessionError as e:
+            print(f"❌ LinkedIn session not usable ({e.status}). Run `python scraper.py --login` "
+                  f"to log in with a visible browser on the same profile and refresh it.")
+            return {"status": e.status}
+
+        if login:
+            print(f"✅ LinkedIn session ready in {user_data_dir or cookies_path}")
+            await close_browser(browser, context)
+            return {"status": SESSION_OK}
+
+        if batch_manifest:
+            summary = await run_batch(context, page, load_manifest(batch_manifest), concurrency=concurrency,
+                                      parallel_details=parallel_details, cache=cache,
+                                      cache_ttl_hours=cache_ttl_hours, output=output, extraction=extraction,
+                                      delay_profile=delay_profile, fields=fields, card_ttl_hours=card_ttl_hours)
+            print(f"\n🎉 Batch completed: {summary['unique_profiles']} unique profiles "
+                  f"from {summary['collected']} search hits")
+            for role_name, written in summary["outputs"].items():
+                print(f"📁 {role_name}: {written['rows']} rows -> {written['output']}")
+            print_run_reports(resource_policy, summary.get("profiles", 0), metrics_json)
+            await close_browser(browser, context)
+            return summary
+
+        if profile_urls is not None:
+            summary = await run_profile_list(context, profile_urls, profile_list_role(profiles_file),
+                                             concurrency=concurrency, parallel_details=parallel_details,
+                                             cache=cache, cache_ttl_hours=cache_ttl_hours, output=output,
+                                             extraction=extraction, delay_profile=delay_profile, fields=fields)
+            if summary.get("rows"):
+                print(f"\n🎉 Scraped {summary['rows']} listed profiles -> {summary['output']}")
+            else:
+                print(f"❌ No profile URLs found in {profiles_file}")
+            print_run_reports(resource_policy, summary.get("profiles", 0), metrics_json)
+            await close_browser(browser, context)
+            return summary
+
+        resuming = bool(job_id and JobJournal(job_id).search_url)
+        if not resuming and not search_url and interactive:
+            # Ask for LinkedIn search results URL
+            print("📝 Please provide the LinkedIn search results URL for any role/position")
+            print("Example: https://www.linkedin.com/search/results/people/?keywords=software%20engineer...")
+            print("Example: https://www.linkedin.com/search/results/people/?keywords=data%20scientist&geoUrn=%5B\"103644278\"%5D")
+            print("Example: https://www.linkedin.com/search/results/people/?keywords=product%20manager&currentCompany=%5B\"1441\"%5D")
+
+            search_url = ask_question("🔗 Enter the LinkedIn search results URL: ").strip()
+
+            if search_url and limit is None:
+                role_name = extract_role_from_url(search_url)
+                print(f"🎯 Detected role: {role_name}")
+                try:
+                    limit = int(ask_question(f"🔢 How many {role_name} profiles to scrape? (default: 10): ").strip() or "10")
+                except Exception:
+                    limit = 10
 
-        print(f"🎯 Target URL: {search_url}")
+                try:
+                    concurrency = int(ask_question(f"⚙️ How many parallel workers? (default: {concurrency}): ").strip() or concurrency)
+                except Exception:
+                    pass
+
+        if not resuming:
+            if not search_url:
+                print("❌ URL is required. Exiting.")
+                await close_browser(browser, context)
+                return {"status": "invalid_url"}
+
+            # Validate URL format
+            if "linkedin.com/search/results/people" not in search_url:
+                print("❌ Please provide a valid LinkedIn people search results URL")
+                await close_browser(browser, context)
+                return {"status": "invalid_url"}
+
+        run = scrape(search_url, limit or 10, context=context, page=page, job_id=job_id, concurrency=concurrency,
+                     parallel_details=parallel_details, cache=cache, cache_ttl_hours=cache_ttl_hours,
+                     output=output, extraction=extraction, delay_profile=delay_profile, pipeline=pipeline,
+                     fields=fields, cards_only=cards_only, card_ttl_hours=card_ttl_hours)
+        async for _ in run:
+            pass
+        summary = run.summary
 
-        # Collect profile URLs from the search results page
-        urls = await collect_search_profile_urls(page, search_url, limit, role_name)
-        
-        if not urls:
-            print(f"❌ No {role_name} profile URLs found. Please check the URL or search filters.")
-            await browser.close()
-            return
+        role_name = summary["role_name"]
+        if summary.get("rows"):
+            if output == "csv":
+                open_excel(summary["output"])
 
-        print(f"🎯 Starting to scrape {len(urls)} {role_name} profiles...")
-        results = []
-        
-        for i, url in enumerate(urls, 1):
-            print(f"\n🔍 [{i}/{len(urls)}] Scraping {role_name} profile: {url}")
-            try:
-                profile_data = await scrape_profile(page, url)
-                results.append(profile_data)
-                
-                if i < len(urls):
-                    delay_time = 5000 + random.randint(2000, 8000)
-                    print(f"⏳ Waiting {delay_time/1000:.1f}s before next profile...")
-                    await delay(delay_time)
-                    
-            except Exception as e:
-                print(f"❌ Failed to scrape profile {url}: {e}")
-                results.append({
-                    "name": "Failed to scrape", 
-                    "title": "N/A", 
-                    "location": "N/A",
-                    "education": "N/A", 
-                    "url": url,
-                    "total_experience": "N/A", 
-                    "experience_details": "N/A",
-                    "skills": "N/A"
-                })
-
-        # Save results to CSV
-        if results:
-            output_file = save_to_csv(results, role_name)
-            open_excel(output_file)
-            
             print(f"\n🎉 LinkedIn {role_name} Profile Scraping completed!")
-            print(f"📊 Total {role_name} profiles scraped: {len(results)}")
-            print(f"📁 Results saved to: {output_file}")
-        else:
+            print(f"📊 Total {role_name} profiles scraped: {summary['rows']}")
+            print(f"📁 Results saved to: {summary['output']}")
+        elif summary["status"] == SESSION_OK:
             print("❌ No data to save.")
 
-        await browser.close()
+        print_run_reports(resource_policy, summary.get("profiles", 0), metrics_json)
+
+        await close_browser(browser, context)
+        return summary
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="LinkedIn people search profile scraper")
+    parser.add_argument("job_id", nargs="?", help="resume this job id")
+    parser.add_argument("--url", dest="search_url", help="LinkedIn people search results URL")
+    parser.add_argument("--limit", type=int, help="number of profiles to scrape")
+    parser.add_argument("--batch", dest="batch_manifest", metavar="MANIFEST",
+                        help="JSONL file of {search_url, limit, role} searches to run in one session")
+    parser.add_argument("--profiles", dest="profiles_file", metavar="FILE",
+                        help="scrape the profiles listed in an earlier output file (e.g. a --cards-only run)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--requests-per-minute", type=int, default=DEFAULT_REQUESTS_PER_MINUTE,
+                        help="starting page-load rate (0 disables pacing)")
+    parser.add_argument("--max-requests-per-minute", type=int, default=DEFAULT_MAX_REQUESTS_PER_MINUTE,
+                        help="ceiling the adaptive rate can grow to")
+    parser.add_argument("--fixed-rate", dest="adaptive_rate", action="store_false",
+                        help="keep --requests-per-minute constant instead of adapting it")
+    parser.add_argument("--output", choices=list(OUTPUT_SINKS), default="csv")
+    parser.add_argument("--cache", choices=CACHE_POLICIES, default="use")
+    parser.add_argument("--cache-ttl-hours", type=float, default=DEFAULT_CACHE_TTL_HOURS)
+    parser.add_argument("--card-ttl-hours", type=float, default=DEFAULT_CARD_CACHE_TTL_HOURS,
+                        help="with --cache incremental, how long a profile with an unchanged search card is reused")
+    parser.add_argument("--delay-profile", choices=list(DELAY_PROFILES), default=DEFAULT_DELAY_PROFILE)
+    parser.add_argument("--extraction", choices=EXTRACTION_MODES, default="dom")
+    parser.add_argument("--fields", help=f"comma-separated columns to scrape (default all): {','.join(OUTPUT_FIELDS)}")
+    parser.add_argument("--parallel-details", action="store_true")
+    parser.add_argument("--cards-only", action="store_true",
+                        help="write name, title and location from the search result cards without visiting profiles")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="start scraping profiles while search results are still being collected")
+    parser.add_argument("--no-block-resources", dest="block_resources", action="store_false")
+    parser.add_argument("--metrics-json", metavar="PATH", help="write per-stage timing percentiles as JSON")
+    # SCRAPER_HEADLESS=1 keeps working as the default for --headless.
+    parser.add_argument("--headless", action="store_true", default=os.environ.get("SCRAPER_HEADLESS") == "1",
+                        help="no window, persistent browser profile, fail fast if a login is needed")
+    parser.add_argument("--login", action="store_true",
+                        help="log in with a visible browser on the --headless profile, then exit")
+    args = parser.parse_args(argv)
+    if args.cards_only and (args.batch_manifest or args.profiles_file):
+        parser.error("--cards-only cannot be combined with --batch or --profiles")
+    return args
 
 # Entry point
 # -----------------------
@@ -806,11 +2875,32 @@ if __name__ == "__main__":
     print("📝 The script will automatically detect the role from your search URL")
     print("=" * 60)
     
+    args = parse_args()
+
+    exit_code = 1
     try:
-        asyncio.run(main())
+        summary = asyncio.run(main(
+            search_url=args.search_url, limit=args.limit, job_id=args.job_id,
+            concurrency=args.concurrency, requests_per_minute=args.requests_per_minute,
+            max_requests_per_minute=args.max_requests_per_minute, adaptive_rate=args.adaptive_rate,
+            output=args.output, cache=args.cache, cache_ttl_hours=args.cache_ttl_hours,
+            card_ttl_hours=args.card_ttl_hours,
+            delay_profile=args.delay_profile, extraction=args.extraction,
+            parallel_details=args.parallel_details, block_resources=args.block_resources,
+            headless=args.headless and not args.login,
+            user_data_dir=browser_profile_dir if args.headless or args.login else None, login=args.login,
+            batch_manifest=args.batch_manifest, pipeline=args.pipeline, metrics_json=args.metrics_json,
+            fields=args.fields, cards_only=args.cards_only, profiles_file=args.profiles_file
+        ))
+        status = (summary or {}).get("status")
+        exit_code = EXIT_CODES.get(status, 1)
+        # The outcome as one JSON line for scripts driving the CLI.
+        print(json.dumps({"status": status, "exit_code": exit_code}))
     except KeyboardInterrupt:
         print("\n⏹️ Scraping interrupted by user.")
+        exit_code = 130
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
 
-    print("\n👋 Thanks for using the LinkedIn Dynamic Profile scraper!")
\ No newline at end of file
+    print("\n👋 Thanks for using the LinkedIn Dynamic Profile scraper!")
+    sys.exit(exit_code)
\ No newline at end of file